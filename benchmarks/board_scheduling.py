@@ -0,0 +1,57 @@
+import argparse
+import random
+import statistics
+import sys
+
+from pathier import Pathier
+
+root = Pathier(__file__).parent.parent
+sys.path.insert(0, str(root))
+
+from jobglob import predict_makespan
+
+""" Compare the glob makespan of starting boards in random order (the previous behavior)
+against starting the longest boards first, using randomly generated scrape durations.
+Most boards are quick, a few (like paginated Workday boards) are much slower.
+"""
+
+
+def get_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=""" Compare random and longest first board scheduling. """
+    )
+    parser.add_argument(
+        "-b", "--num_boards", type=int, default=2000, help=""" Number of boards. """
+    )
+    parser.add_argument(
+        "-w", "--num_workers", type=int, default=32, help=""" Number of workers. """
+    )
+    parser.add_argument(
+        "-r", "--runs", type=int, default=20, help=""" Number of random orders to try. """
+    )
+    parser.add_argument("-s", "--seed", type=int, default=0, help=""" Random seed. """)
+    return parser.parse_args()
+
+
+def main(args: argparse.Namespace):
+    random.seed(args.seed)
+    durations = [
+        random.uniform(60, 300) if random.random() < 0.02 else random.uniform(0.5, 5)
+        for _ in range(args.num_boards)
+    ]
+    lower_bound = max(sum(durations) / args.num_workers, max(durations))
+    shuffled: list[float] = []
+    for _ in range(args.runs):
+        random.shuffle(durations)
+        shuffled.append(predict_makespan(durations, args.num_workers))
+    longest_first = predict_makespan(sorted(durations, reverse=True), args.num_workers)
+    print(f"{args.num_boards} boards, {args.num_workers} workers")
+    print(f"  lower bound: {lower_bound:.1f}s")
+    print(
+        f"  random order: {statistics.mean(shuffled):.1f}s average, {max(shuffled):.1f}s worst over {args.runs} orders"
+    )
+    print(f"  longest first: {longest_first:.1f}s")
+
+
+if __name__ == "__main__":
+    main(get_args())
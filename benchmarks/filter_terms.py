@@ -0,0 +1,106 @@
+import argparse
+import random
+import string
+import sys
+from typing import Iterable, Iterator
+
+from noiftimer import Timer
+from pathier import Pathier
+
+root = Pathier(__file__).parent.parent
+sys.path.insert(0, str(root))
+
+import models
+import peruse
+from peruse_filters import compile_terms
+
+""" Compare `peruse` filtering with per term substring checks (the previous implementation)
+against the compiled patterns from `peruse_filters.compile_terms`, using randomly generated listings and filter terms.
+"""
+
+
+def legacy_filter_listings(
+    listings: Iterable[models.Listing],
+    filter_on: str,
+    key_terms: list[str],
+    exclude_terms: list[str],
+) -> Iterator[models.Listing]:
+    for listing in listings:
+        column = getattr(listing, filter_on).lower()
+        if any(exclude in column for exclude in exclude_terms):
+            continue
+        if key_terms and all(key not in column for key in key_terms):
+            continue
+        yield listing
+
+
+def random_words(num_words: int) -> list[str]:
+    return [
+        "".join(random.choices(string.ascii_lowercase, k=random.randint(3, 10)))
+        for _ in range(num_words)
+    ]
+
+
+def get_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=""" Compare per term and compiled `peruse` filtering on random data. """
+    )
+    parser.add_argument(
+        "-l", "--num_listings", type=int, default=10000, help=""" Number of listings. """
+    )
+    parser.add_argument(
+        "-t",
+        "--num_terms",
+        type=int,
+        default=500,
+        help=""" Number of terms in each of `position_filters` and `location_filters`. """,
+    )
+    parser.add_argument("-s", "--seed", type=int, default=0, help=""" Random seed. """)
+    return parser.parse_args()
+
+
+def main(args: argparse.Namespace):
+    random.seed(args.seed)
+    vocabulary = random_words(args.num_terms * 6)
+    company = models.Company(1, "Company")
+    listings = [
+        models.Listing(
+            company,
+            i,
+            " ".join(random.choices(vocabulary, k=5)).title(),
+            " ".join(random.choices(vocabulary, k=2)).title(),
+        )
+        for i in range(args.num_listings)
+    ]
+    position_filters = random.sample(vocabulary, args.num_terms)
+    location_filters = random.sample(vocabulary, args.num_terms)
+    key_terms = random.sample(vocabulary, 10)
+
+    timer = Timer().start()
+    legacy = legacy_filter_listings(listings, "location", [], location_filters)
+    legacy = list(
+        legacy_filter_listings(legacy, "position", key_terms, position_filters)
+    )
+    legacy_time = timer.elapsed
+
+    timer = Timer().start()
+    excludes = {
+        "location": compile_terms(location_filters),
+        "position": compile_terms(position_filters),
+    }
+    compile_time = timer.elapsed
+    compiled = list(peruse.filter_listings(listings, excludes, compile_terms(key_terms)))
+    compiled_time = timer.elapsed
+
+    assert [listing.id for listing in legacy] == [listing.id for listing in compiled]
+    print(
+        f"{args.num_listings} listings, {args.num_terms} position and location filter terms, {len(key_terms)} key terms -> {len(compiled)} listings"
+    )
+    print(f"  per term: {legacy_time * 1000:.1f}ms")
+    print(
+        f"  compiled: {compiled_time * 1000:.1f}ms ({compile_time * 1000:.1f}ms compiling), {legacy_time / compiled_time:.1f}x faster"
+    )
+
+
+if __name__ == "__main__":
+    main(get_args())
@@ -0,0 +1,115 @@
+import argparse
+import multiprocessing
+import resource
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+
+from noiftimer import Timer
+from pathier import Pathier
+
+root = Pathier(__file__).parent.parent
+sys.path.insert(0, str(root))
+
+from config import Config
+from jobbased import JobBased
+
+config = Config.load()
+""" Compare the memory footprint and load time of the full `listings` table
+between the old model layout (a `__dict__` per instance and a new `Company` for every row)
+and the current one (slotted models sharing one `Company` per `company_id`).
+
+Each variant is loaded in a fresh process so their peak RSS can be compared.
+"""
+
+
+@dataclass
+class LegacyCompany:
+    id: int = -1
+    name: str = ""
+    date_added: datetime = datetime.now()
+
+
+@dataclass
+class LegacyListing:
+    company: LegacyCompany
+    id: int = -1
+    position: str = ""
+    location: str = ""
+    url: str = ""
+    alive: bool = True
+    date_added: datetime = datetime.now()
+    date_removed: datetime | None = None
+
+
+def load_legacy(dbpath: Pathier) -> list[LegacyListing]:
+    with JobBased(dbpath) as db:
+        return [
+            LegacyListing(
+                LegacyCompany(row["c_id"], row["name"], row["c_date"]),
+                row["l_id"],
+                row["position"],
+                row["location"],
+                row["url"],
+                bool(row["alive"]),
+                row["l_date"],
+                row["date_removed"],
+            )
+            for row in db.query(
+                "SELECT listing_id AS l_id, position, location, url, companies.company_id AS c_id, name, listings.date_added AS l_date, companies.date_added AS c_date, date_removed, alive FROM listings INNER JOIN companies ON listings.company_id = companies.company_id;"
+            )
+        ]
+
+
+def load_current(dbpath: Pathier) -> list[object]:
+    with JobBased(dbpath) as db:
+        return list(db.get_listings())
+
+
+def measure(variant: str, dbpath: Pathier) -> tuple[int, float, int]:
+    """Load the `listings` table with `variant` and return the number of listings,
+    the load time, and the growth in peak RSS (in KiB)."""
+    load = load_legacy if variant == "legacy" else load_current
+    # Open and migrate the database first so that isn't counted against either variant
+    with JobBased(dbpath) as db:
+        db.count("listings")
+    start_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timer = Timer().start()
+    listings = load(dbpath)
+    elapsed = timer.elapsed
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - start_rss
+    return len(listings), elapsed, rss
+
+
+def get_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=""" Compare peak RSS and load time for the full `listings` table using the old and current models. """
+    )
+    parser.add_argument(
+        "dbpath",
+        nargs="?",
+        type=Pathier,
+        default=config.db_path,
+        help=""" The database to load listings from. Defaults to `db_path` in `config.toml`. """,
+    )
+    return parser.parse_args()
+
+
+def main(args: argparse.Namespace):
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        results = {
+            variant: pool.apply(measure, (variant, args.dbpath))
+            for variant in ["legacy", "current"]
+        }
+    for variant, (num_listings, elapsed, rss) in results.items():
+        print(
+            f"{variant:>8}: {num_listings} listings in {elapsed:.2f}s, peak RSS +{rss / 1024:.1f} MiB"
+        )
+    legacy_rss, current_rss = results["legacy"][2], results["current"][2]
+    if legacy_rss:
+        print(f"Peak RSS reduced by {(1 - current_rss / legacy_rss) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main(get_args())
@@ -0,0 +1,148 @@
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from noiftimer import Timer
+from pathier import Pathier
+from typing_extensions import override
+
+root = Pathier(__file__).parent.parent
+sys.path.insert(0, str(root))
+
+import jobgruel
+import models
+
+""" Time fetching paginated Workday and SmartRecruiters style boards from a local server
+with one page at a time (the previous behavior) against `max_concurrent_pages` at a time
+in a page executor like the one `JobGlob` shares between boards.
+
+Every response from the server is delayed by `--latency` to stand in for a round trip to the real board.
+"""
+
+
+def get_handler(num_listings: int, latency: float) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def send(self, body: bytes, content_type: str):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            # Workday: offset and limit in the body, total in every response
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            offset, limit = int(request["offset"]), int(request["limit"])
+            postings = [
+                {"title": f"Job {i}", "externalPath": f"/job/{i}"}
+                for i in range(offset, min(offset + limit, num_listings))
+            ]
+            body = json.dumps({"total": num_listings, "jobPostings": postings})
+            self.send(body.encode(), "application/json")
+
+        def do_GET(self):
+            # SmartRecruiters: 10 listings per page, an empty body past the last page
+            page = int(self.path.split("page=")[-1]) if "page=" in self.path else 0
+            links = "".join(
+                f'<a class="link--block details" href="/job/{i}"><h4>Job {i}</h4></a>'
+                for i in range(page * 10, min((page + 1) * 10, num_listings))
+            )
+            self.send(links.encode(), "text/html")
+
+        def log_message(self, *args: Any):
+            pass
+
+    return Handler
+
+
+class WorkdayScraper(jobgruel.MyworkdayGruel):
+    @property
+    @override
+    def api_url(self) -> str:
+        return self.board.url
+
+
+class SmartrecruiterScraper(jobgruel.SmartrecruiterGruel):
+    @property
+    @override
+    def api_endpoint(self) -> str:
+        return f"{self.board.url}/api/more?page="
+
+
+def time_scraper(
+    scraper_class: type[jobgruel.PaginatedGruel],
+    url: str,
+    page_executor: Executor | None,
+    max_concurrent_pages: int,
+) -> tuple[float, int, int]:
+    """Returns the time it took to get `url`'s source, the number of pages, and the number of listings."""
+    board = models.Board(models.Company(name="paginated fetch benchmark"), url=url)
+    scraper = scraper_class({}, board=board)
+    scraper.page_executor = page_executor
+    scraper.max_concurrent_pages = max_concurrent_pages
+    timer = Timer().start()
+    source = scraper.get_source()
+    elapsed = timer.elapsed
+    num_listings = len(scraper.get_parsable_items(source))
+    scraper.logger.close()
+    return elapsed, len(source), num_listings
+
+
+def get_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=""" Time sequential and concurrent fetching of paginated boards. """
+    )
+    parser.add_argument(
+        "-l", "--num_listings", type=int, default=500, help=""" Listings per board. """
+    )
+    parser.add_argument(
+        "-d",
+        "--latency",
+        type=float,
+        default=0.05,
+        help=""" Seconds the server waits before each response. """,
+    )
+    parser.add_argument(
+        "-c",
+        "--max_concurrent_pages",
+        type=int,
+        default=jobgruel.config.jobglob.max_concurrent_pages,
+        help=""" Pages requested at once in the concurrent runs. """,
+    )
+    return parser.parse_args()
+
+
+def main(args: argparse.Namespace):
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), get_handler(args.num_listings, args.latency)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    page_executor = ThreadPoolExecutor(jobgruel.config.jobglob.page_workers)
+    print(f"{args.num_listings} listings per board, {args.latency * 1000:.0f}ms latency")
+    for name, scraper_class, url in [
+        ("Workday", WorkdayScraper, f"{base}/wday/jobs"),
+        ("SmartRecruiters", SmartrecruiterScraper, f"{base}/sr"),
+    ]:
+        sequential, num_pages, num_listings = time_scraper(scraper_class, url, None, 1)
+        concurrent, *counts = time_scraper(
+            scraper_class, url, page_executor, args.max_concurrent_pages
+        )
+        assert counts == [num_pages, num_listings]
+        print(f"  {name}: {num_pages} pages, {num_listings} listings")
+        print(f"    one page at a time: {sequential:.2f}s")
+        print(
+            f"    {args.max_concurrent_pages} pages at a time: {concurrent:.2f}s, {sequential / concurrent:.1f}x faster"
+        )
+    page_executor.shutdown()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main(get_args())
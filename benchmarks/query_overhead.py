@@ -0,0 +1,131 @@
+"""Compare the per call overhead of `JobBased.mark_seen`, `mark_dead`, and `get_company_from_name`
+with the f-string query versions they replaced.
+
+Queries with values formatted into them have different SQL text on every call,
+so SQLite has to parse and plan each one instead of reusing a cached prepared statement.
+
+Runs against a temporary copy of the database so the real one isn't modified.
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+from typing import Callable
+
+from pathier import Pathier
+
+root = Pathier(__file__).parent.parent
+sys.path.insert(0, str(root))
+
+import models
+from config import Config
+from jobbased import JobBased
+
+config = Config.load()
+
+
+# The previous implementations of each method
+
+
+def legacy_mark_seen(db: JobBased, listing_id: int):
+    db.insert("seen_listings", ("listing_id",), [(listing_id,)])
+
+
+def legacy_mark_dead(db: JobBased, listing_id: int):
+    db.update("listings", "alive", 0, f"listing_id = {listing_id}")
+    db.update("listings", "date_removed", datetime.now(), f"listing_id = {listing_id}")
+
+
+def legacy_get_company_from_name(
+    db: JobBased, company_name: str
+) -> models.Company | None:
+    try:
+        company = db.select("companies", where=f"name LIKE '{company_name}'")[0]
+    except Exception as e:
+        return None
+    return models.Company(company["company_id"], company["name"], company["date_added"])
+
+
+def time_calls(
+    function: Callable[[JobBased, int], None], db: JobBased, ids: list[int]
+) -> float:
+    """Returns the average seconds per call of `function` for each of `ids`, rolling back afterwards."""
+    # Don't count the first call, which may open the connection
+    function(db, ids[0])
+    elapsed = timeit.timeit(lambda: [function(db, id_) for id_ in ids[1:]], number=1)
+    assert db.connection
+    db.connection.rollback()
+    return elapsed / (len(ids) - 1)
+
+
+def get_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=""" Compare per call overhead of parameterized and f-string `JobBased` queries. """
+    )
+    parser.add_argument(
+        "dbpath",
+        nargs="?",
+        type=Pathier,
+        default=config.db_path,
+        help=""" The database to copy and benchmark against. Defaults to `db_path` in `config.toml`. """,
+    )
+    parser.add_argument(
+        "-n",
+        "--num_calls",
+        type=int,
+        default=5000,
+        help=""" The number of calls to time for each method. """,
+    )
+    return parser.parse_args()
+
+
+def main(args: argparse.Namespace):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        dbpath = Pathier(temp_dir) / "jobs.db"
+        shutil.copy(args.dbpath, dbpath)
+        with JobBased(dbpath, commit_on_close=False) as db:
+            listing_ids = [
+                row["listing_id"]
+                for row in db.select(
+                    "listings",
+                    ["listing_id"],
+                    where="listing_id NOT IN (SELECT listing_id FROM seen_listings)",
+                    limit=args.num_calls,
+                )
+            ]
+            # The f-string version breaks on names with quotes
+            names = [
+                company.name
+                for company in db.get_companies()
+                if "'" not in company.name
+            ]
+            if len(listing_ids) < 2 or not names:
+                print("Not enough listings or companies to benchmark.")
+                return
+            company_names = [names[i % len(names)] for i in range(len(listing_ids))]
+            results = {
+                "mark_seen": (
+                    time_calls(legacy_mark_seen, db, listing_ids),
+                    time_calls(JobBased.mark_seen, db, listing_ids),
+                ),
+                "mark_dead": (
+                    time_calls(legacy_mark_dead, db, listing_ids),
+                    time_calls(JobBased.mark_dead, db, listing_ids),
+                ),
+                "get_company_from_name": (
+                    time_calls(legacy_get_company_from_name, db, company_names),  # type: ignore
+                    time_calls(JobBased.get_company_from_name, db, company_names),  # type: ignore
+                ),
+            }
+    print(f"Average per call over {len(listing_ids) - 1} calls:")
+    for method, (legacy, current) in results.items():
+        print(
+            f"{method:>22}: f-string {legacy * 1e6:.1f}us, parameterized {current * 1e6:.1f}us ({legacy / current:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main(get_args())
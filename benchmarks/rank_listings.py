@@ -0,0 +1,113 @@
+import argparse
+import math
+import random
+import string
+import sys
+from collections import Counter
+
+import numpy as np
+from noiftimer import Timer
+from pathier import Pathier
+
+root = Pathier(__file__).parent.parent
+sys.path.insert(0, str(root))
+
+from listingranker import ListingRanker, tokenize
+
+""" Time `ListingRanker.scores` on randomly generated positions,
+checking its results against a straightforward per position BM25 loop.
+"""
+
+
+def loop_scores(ranker: ListingRanker, positions: list[str]) -> list[float]:
+    scores: list[float] = []
+    num_documents = max(ranker.num_documents, 1)
+    for position in positions:
+        terms = tokenize(position)
+        frequencies = Counter(terms)
+        score = 0.0
+        for term, weight in ranker.query.items():
+            frequency = frequencies.get(term, 0)
+            if not frequency:
+                continue
+            document_frequency = min(
+                max(ranker.document_frequencies.get(term, 0), 1), num_documents
+            )
+            idf = math.log(
+                (num_documents - document_frequency + 0.5)
+                / (document_frequency + 0.5)
+                + 1
+            )
+            norm = ranker.k1 * (
+                1 - ranker.b + ranker.b * len(terms) / max(ranker.average_length, 1.0)
+            )
+            score += (
+                weight * idf * frequency * (ranker.k1 + 1) / (frequency + norm)
+            )
+        scores.append(score)
+    return scores
+
+
+def get_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=""" Time BM25 ranking of random positions. """
+    )
+    parser.add_argument(
+        "-l", "--num_listings", type=int, default=50000, help=""" Number of listings. """
+    )
+    parser.add_argument(
+        "-t",
+        "--num_terms",
+        type=int,
+        default=200,
+        help=""" Number of weighted query terms. """,
+    )
+    parser.add_argument("-s", "--seed", type=int, default=0, help=""" Random seed. """)
+    return parser.parse_args()
+
+
+def main(args: argparse.Namespace):
+    random.seed(args.seed)
+    vocabulary = [
+        "".join(random.choices(string.ascii_lowercase, k=random.randint(3, 10)))
+        for _ in range(5000)
+    ]
+    # Skew term usage so some terms are much more common than others, like real positions
+    usage = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    positions = [
+        " ".join(random.choices(vocabulary, usage, k=random.randint(2, 8))).title()
+        for _ in range(args.num_listings)
+    ]
+    tokenized = [tokenize(position) for position in positions]
+    document_counts = Counter(term for terms in tokenized for term in set(terms))
+    query = {
+        term: random.choice([1.0, random.random()])
+        for term in random.sample(vocabulary[:1000], args.num_terms)
+    }
+    ranker = ListingRanker(
+        query,
+        {term: document_counts[term] for term in query},
+        len(positions),
+        sum(len(terms) for terms in tokenized) / len(positions),
+    )
+
+    timer = Timer().start()
+    loop = loop_scores(ranker, positions)
+    loop_time = timer.elapsed
+
+    timer = Timer().start()
+    vectorized = ranker.scores(positions)
+    vectorized_time = timer.elapsed
+
+    assert np.allclose(loop, vectorized)
+    print(
+        f"{args.num_listings} positions, {args.num_terms} query terms -> {np.count_nonzero(vectorized)} with a nonzero score"
+    )
+    print(f"  per position loop: {loop_time * 1000:.1f}ms")
+    print(
+        f"  vectorized: {vectorized_time * 1000:.1f}ms, {loop_time / vectorized_time:.1f}x faster"
+    )
+
+
+if __name__ == "__main__":
+    main(get_args())
@@ -1,4 +1,3 @@
-import functools
 from dataclasses import asdict, dataclass
 
 import dacite
@@ -9,6 +8,37 @@ from typing_extensions import Optional, Self
 @dataclass
 class JobglobDaemon:
     glob_interval: int
+    max_interval: int
+    backoff: float
+
+
+@dataclass
+class Jobglob:
+    engine: str
+    max_connections: int
+    max_connections_per_host: int
+    parse_processes: int
+    write_batch_size: int
+    runtime_weight: float
+    max_concurrent_pages: int
+    page_workers: int
+
+
+@dataclass
+class Database:
+    pool_size: int
+    journal_mode: str
+    synchronous: str
+    mmap_size: int
+    busy_timeout: int
+    cache_size: int
+    cached_statements: int
+
+
+@dataclass
+class Peruse:
+    page_size: int
+    flush_every: int
 
 
 @dataclass
@@ -16,14 +46,18 @@ class Config:
     logs_dir: Pathier
     scrapers_dir: Pathier
     jobglob_daemon: JobglobDaemon
+    jobglob: Jobglob
+    database: Database
+    peruse: Peruse
     board_meta_path: Pathier
     careers_page_stubs_path: Pathier
     db_path: Pathier
     sql_dir: Pathier
+    migrations_dir: Pathier
     templates_dir: Pathier
     peruse_filters_path: Pathier
 
-    @functools.cached_property
+    @property
     def scraper_logs_dir(self) -> Pathier:
         return self.logs_dir / self.scrapers_dir.stem
 
@@ -3,6 +3,7 @@ import sys
 from databased import Databased
 from pathier import Pathier
 
+import jobbased
 from config import Config
 
 root = Pathier(__file__).parent
@@ -12,6 +13,8 @@ config = Config.load()
 def init(silent_overwrite: bool = False):
     """Initialize and build database, populating with data from `sql/jobs_data.sql` if present."""
     db_path = config.db_path
+    # Pooled connections would otherwise keep pointing at the deleted file
+    jobbased.close_pools()
     if silent_overwrite:
         db_path.delete()
     if db_path.exists():
@@ -31,6 +34,10 @@ def init(silent_overwrite: bool = False):
         db.execute_script(config.sql_dir / "schema.sql")
         for view in views:
             db.execute_script(view)
+    # Migrate before inserting data since dumps include columns added by migrations
+    with jobbased.JobBased(db_path) as db:
+        print("Applying migrations.")
+        db.migrate()
         data_path = config.sql_dir / "jobs_data.sql"
         if data_path.exists():
             print("Inserting data.")
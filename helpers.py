@@ -1,4 +1,5 @@
 import os
+import re
 from datetime import datetime
 from typing import Generator
 
@@ -23,6 +24,16 @@ def stem_to_name(stem: str) -> str:
     return " ".join(word.capitalize() for word in stem.split("_"))
 
 
+_term = re.compile(r"[\w+#]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split `text` into lowercase terms.
+
+    `+` and `#` are kept so terms like "c++" and "c#" aren't lost."""
+    return _term.findall(text.lower())
+
+
 def create_scraper_from_template(url: str, company: str, board_type: str | None = None):
     """Create scraper file from template and write to scrapers directory given a `url` and `company`."""
     templates_path = config.templates_dir
@@ -1,57 +1,468 @@
-from datetime import datetime
-from typing import Any
+import queue
+import sqlite3
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Any, Iterable, Iterator, Sequence
 
 from databased import Databased, Rows
+from databased.databased import dict_factory
 from pathier import Pathier, Pathish
+from typing_extensions import override
 
+import helpers
 import models
 from config import Config
+from peruse_filters import PeruseFilters, like_any
 
 root = Pathier(__file__).parent
 config = Config.load()
 
 
+# Columns to select, from `listings` joined with `companies`, to build a `models.Listing` with `JobBased._listing_from_row`
+listing_columns = """
+    listings.listing_id AS l_id, position, location, url, companies.company_id AS c_id, name,
+    listings.date_added AS l_date, companies.date_added AS c_date, date_removed, alive"""
+
+
+class ConnectionPool:
+    """Thread safe pool of open connections to a database file.
+
+    New connections have the pragmas from the `[database]` section of `config.toml` applied.
+    """
+
+    def __init__(
+        self,
+        path: Pathier,
+        detect_types: bool,
+        timeout: float,
+        size: int = config.database.pool_size,
+    ):
+        self.path = path
+        self.detect_types = detect_types
+        self.timeout = timeout
+        self.size = size
+        self._connections: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.path,
+            detect_types=(
+                sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
+                if self.detect_types
+                else 0
+            ),
+            timeout=self.timeout,
+            # Pooled connections get handed to whichever thread needs one next
+            check_same_thread=False,
+            # Statements are cached by their SQL text, so queries with bound parameters get reused
+            cached_statements=config.database.cached_statements,
+        )
+        settings = config.database
+        for pragma in [
+            f"journal_mode = {settings.journal_mode}",
+            f"synchronous = {settings.synchronous}",
+            f"mmap_size = {settings.mmap_size}",
+            f"busy_timeout = {settings.busy_timeout}",
+            f"cache_size = {settings.cache_size}",
+        ]:
+            connection.execute(f"pragma {pragma};")
+        return connection
+
+    def acquire(self) -> sqlite3.Connection:
+        """Returns an idle connection from the pool or a new one if there aren't any."""
+        try:
+            return self._connections.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def release(self, connection: sqlite3.Connection):
+        """Return `connection` to the pool, closing it if the pool is full.
+
+        Any uncommitted changes are rolled back."""
+        if connection.in_transaction:
+            connection.rollback()
+        if self._connections.qsize() < self.size:
+            self._connections.put(connection)
+        else:
+            connection.close()
+
+    def clear(self):
+        """Close every idle connection in the pool."""
+        while True:
+            try:
+                self._connections.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pools: dict[tuple[str, bool, float], ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(path: Pathier, detect_types: bool, timeout: float) -> ConnectionPool:
+    """Returns the shared `ConnectionPool` for these connection settings."""
+    key = (str(path.resolve()), detect_types, timeout)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(path, detect_types, timeout)
+        return _pools[key]
+
+
+def split_statements(script: str) -> list[str]:
+    """Split an sql script into individual statements."""
+    statements: list[str] = []
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            statements.append(statement.strip())
+            statement = ""
+    if statement.strip():
+        statements.append(statement.strip())
+    return statements
+
+
+_migrated_paths: set[str] = set()
+_migration_lock = threading.Lock()
+
+
+def close_pools():
+    """Close all idle pooled connections, e.g. before deleting or replacing the database file."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.clear()
+
+
+# The `listings_fts` trigram index can't match terms shorter than this
+min_search_term_length = 3
+
+
+def to_search_query(terms: Iterable[str], column: str | None = None) -> str:
+    """Returns an FTS5 query matching any of `terms` as a literal substring.
+
+    If `column` is given, only that column of `listings_fts` is searched.
+
+    >>> to_search_query(["python", "data engineer"], "position")
+    >>> 'position : ("python" OR "data engineer")'
+    """
+    query = " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
+    return f"{column} : ({query})" if column else f"({query})"
+
+
+def select_listing_ids(where: str) -> str:
+    """Returns a query selecting the `listing_id` of every listing satisfying the `where` clause.
+
+    `where` can reference columns of `listings` and `companies`,
+    e.g. `"companies.name = 'Company' AND position LIKE '%senior%'"`."""
+    return f"SELECT listings.listing_id FROM listings INNER JOIN companies ON listings.company_id = companies.company_id WHERE {where}"
+
+
 class JobBased(Databased):
-    """Database interface for `jobs.db`."""
+    """Database interface for `jobs.db`.
+
+    Connections are borrowed from and returned to a `ConnectionPool` instead of being opened and closed every time.
+    """
+
+    def __init__(self, dbpath: Pathish | None = None, *args: Any, **kwargs: Any):
+        # Resolved per call rather than as the default so a changed `config.db_path` is picked up
+        super().__init__(
+            dbpath or config.db_path, *args, log_dir=config.logs_dir, **kwargs
+        )
+        # Identity map so every model loaded through this instance shares one `models.Company` per `company_id`
+        self._companies: dict[int, models.Company] = {}
+
+    def _get_company(
+        self, company_id: int, name: str, date_added: datetime
+    ) -> models.Company:
+        """Returns the `models.Company` for `company_id`, only creating one the first time it's seen.
+
+        The existing instance is updated in place if the company's name has changed."""
+        company = self._companies.get(company_id)
+        if not company:
+            company = models.Company(company_id, name, date_added)
+            self._companies[company_id] = company
+        elif company.name != name:
+            # Renamed since it was first loaded
+            company.name = name
+        return company
+
+    @property
+    def pool(self) -> ConnectionPool:
+        """The connection pool for this database."""
+        return get_pool(self.path, self.detect_types, self.connection_timeout)
+
+    @override
+    def connect(self):
+        self.connection = self.pool.acquire()
+        self._set_foreign_key_enforcement()
+        self.connection.row_factory = dict_factory
+        # Bring the database up to date the first time this process connects to it
+        key = str(self.path.resolve())
+        if key not in _migrated_paths:
+            with _migration_lock:
+                if key not in _migrated_paths:
+                    try:
+                        self.migrate()
+                    except Exception:
+                        # Hand the connection back, with the failed migration rolled back, instead of leaking it
+                        self.pool.release(self.connection)
+                        self.connection = None
+                        raise
+                    _migrated_paths.add(key)
+
+    @override
+    def close(self):
+        if self.connection:
+            if self.commit_on_close:
+                self.commit()
+            self.pool.release(self.connection)
+            self.connection = None
+
+    @override
+    def select(
+        self,
+        table: str,
+        columns: Iterable[str] = ["*"],
+        joins: Iterable[str] | None = None,
+        where: str | None = None,
+        group_by: str | None = None,
+        having: str | None = None,
+        order_by: str | None = None,
+        limit: int | str | None = None,
+        exclude_columns: Iterable[str] | None = None,
+        parameters: Sequence[Any] = (),
+    ) -> Rows:
+        """Return rows for given criteria.
+
+        Same as `Databased.select`, but values can be bound to `?` placeholders in the clauses with `parameters`:
+
+        >>> db.select("companies", where="name = ?", parameters=("O'Reilly",))
+        """
+        if exclude_columns:
+            columns = [
+                column
+                for column in self.get_columns(table)
+                if column not in exclude_columns
+            ]
+        query = f"SELECT {', '.join(columns)} FROM {table}"
+        if joins:
+            query += f" {' '.join(joins)}"
+        if where:
+            query += f" WHERE {where}"
+        if group_by:
+            query += f" GROUP BY {group_by}"
+        if having:
+            query += f" HAVING {having}"
+        if order_by:
+            query += f" ORDER BY {order_by}"
+        if limit:
+            query += f" LIMIT {limit}"
+        query += ";"
+        return self.query(query, parameters)
+
+    @override
+    def update(
+        self,
+        table: str,
+        column: str,
+        value: Any,
+        where: str | None = None,
+        parameters: Sequence[Any] = (),
+    ) -> int:
+        """Update `column` of `table` to `value` for rows satisfying the conditions in `where`.
+
+        Values for any `?` placeholders in `where` can be given with `parameters`.
+
+        Returns the number of updated rows."""
+        query = f"UPDATE {table} SET {column} = ?"
+        if where:
+            query += f" WHERE {where}"
+        try:
+            self.query(f"{query};", (value, *parameters))
+            row_count = self.cursor.rowcount
+            self.logger.info(
+                f"Updated {row_count} rows in '{table}' table to '{column}' = '{value}' where '{where}' {tuple(parameters)}."
+            )
+            return row_count
+        except Exception as e:
+            self.logger.exception(
+                f"Failed to update rows in '{table}' table to '{column}' = '{value}' where '{where}' {tuple(parameters)}."
+            )
+            raise e
+
+    @override
+    def delete(
+        self, table: str, where: str | None = None, parameters: Sequence[Any] = ()
+    ) -> int:
+        """Delete rows from `table` that satisfy the given `where` clause.
+
+        Values for any `?` placeholders in `where` can be given with `parameters`.
+
+        Returns the number of deleted rows."""
+        query = f"DELETE FROM {table}"
+        if where:
+            query += f" WHERE {where}"
+        try:
+            self.query(f"{query};", parameters)
+            row_count = self.cursor.rowcount
+            self.logger.info(
+                f"Deleted {row_count} rows from '{table}' where '{where}' {tuple(parameters)}."
+            )
+            return row_count
+        except Exception as e:
+            self.logger.exception(
+                f"Error deleting rows from '{table}' where '{where}' {tuple(parameters)}."
+            )
+            raise e
+
+    @override
+    def count(
+        self,
+        table: str,
+        column: str = "*",
+        where: str | None = None,
+        distinct: bool = False,
+        parameters: Sequence[Any] = (),
+    ) -> int:
+        """Return number of matching rows in `table` table.
+
+        Values for any `?` placeholders in `where` can be given with `parameters`."""
+        query = f"SELECT COUNT({'DISTINCT ' if distinct else ''}{column}) AS count FROM {table}"
+        if where:
+            query += f" WHERE {where}"
+        return int(self.query(f"{query};", parameters)[0]["count"])
+
+    @property
+    def schema_version(self) -> int:
+        """The version of the last migration applied to this database."""
+        self.query(
+            "CREATE TABLE IF NOT EXISTS schema_version (version INTEGER PRIMARY KEY, name TEXT, date_applied TIMESTAMP);"
+        )
+        return self.query("SELECT MAX(version) AS version FROM schema_version;")[0][
+            "version"
+        ] or 0
+
+    def get_migrations(self) -> list[tuple[int, Pathier]]:
+        """Returns `(version, path)` for each script in the migrations directory, ordered by version.
+
+        Migration scripts are named `{version}_{description}.sql`, e.g. `0001_listing_indexes.sql`."""
+        return sorted(
+            (int(path.stem.split("_", 1)[0]), path)
+            for path in config.migrations_dir.glob("*.sql")
+        )
+
+    def migrate(self) -> list[str]:
+        """Apply any migrations newer than `self.schema_version`, each in its own transaction.
 
-    def __init__(self, dbpath: Pathish = config.db_path, *args: Any, **kwargs: Any):
-        super().__init__(dbpath, *args, log_dir=config.logs_dir, **kwargs)
+        Does nothing if the base schema (`sql/schema.sql`) hasn't been created yet.
+
+        Returns the names of the applied migrations."""
+        if "listings" not in self.tables:
+            return []
+        assert self.connection
+        applied: list[str] = []
+        for version, path in self.get_migrations():
+            self.connection.execute("BEGIN IMMEDIATE;")
+            try:
+                # Checked inside the transaction in case another process just applied it
+                if version <= self.schema_version:
+                    self.connection.rollback()
+                    continue
+                for statement in split_statements(path.read_text(encoding="utf-8")):
+                    self.connection.execute(statement)
+                self.connection.execute(
+                    "INSERT INTO schema_version (version, name, date_applied) VALUES (?, ?, ?);",
+                    (version, path.stem, datetime.now()),
+                )
+                self.connection.commit()
+            except Exception as e:
+                self.connection.rollback()
+                self.logger.exception(f"Failed to apply migration `{path.name}`.")
+                raise e
+            self.logger.info(f"Applied migration `{path.name}`.")
+            applied.append(path.stem)
+        return applied
 
     def _get_listings(
-        self, where: str = "1 = 1", order_by: str | None = None
+        self,
+        where: str = "1 = 1",
+        order_by: str | None = None,
+        parameters: Sequence[Any] = (),
     ) -> list[models.Listing]:
-        """Returns `model.Listing` objects satisfying the given `where` clause."""
-        data = self.select(
-            "listings",
-            [
-                "listing_id AS l_id",
-                "position",
-                "location",
-                "url",
-                "companies.company_id AS c_id",
-                "name",
-                "listings.date_added AS l_date",
-                "companies.date_added AS c_date",
-                "date_removed",
-                "alive",
-            ],
-            ["INNER JOIN companies ON listings.company_id = companies.company_id"],
-            where=where,
-            order_by=order_by,
+        """Returns `model.Listing` objects satisfying the given `where` clause.
+
+        Values for any `?` placeholders in `where` can be given with `parameters`."""
+        return list(self.iter_listings(where, order_by, parameters=parameters))
+
+    def iter_listings(
+        self,
+        where: str = "1 = 1",
+        order_by: str | None = None,
+        batch_size: int = 1000,
+        parameters: Sequence[Any] = (),
+    ) -> Iterator[models.Listing]:
+        """Lazily yield `model.Listing` objects satisfying the given `where` clause.
+
+        Values for any `?` placeholders in `where` can be given with `parameters`.
+
+        Rows are fetched from the database `batch_size` at a time,
+        so the full result set is never held in memory.
+
+        The connection has to stay open until the iterator is exhausted:
+
+        >>> with JobBased() as db:
+        >>>     for listing in db.iter_listings("alive = 1"):
+        >>>         ...
+        """
+        query = f"""
+            SELECT {listing_columns}
+            FROM listings INNER JOIN companies ON listings.company_id = companies.company_id
+            WHERE {where}"""
+        if order_by:
+            query += f" ORDER BY {order_by}"
+        if not self.connected:
+            self.connect()
+        assert self.connection
+        # Use a dedicated cursor so other queries made while iterating don't interrupt this one
+        cursor = self.connection.cursor()
+        cursor.execute(query, parameters)
+        try:
+            while rows := cursor.fetchmany(batch_size):
+                for row in rows:
+                    yield self._listing_from_row(row)
+        finally:
+            cursor.close()
+
+    def _listing_from_row(self, row: dict[str, Any]) -> models.Listing:
+        """Returns a `models.Listing` from a row selected with `listing_columns`."""
+        return models.Listing(
+            self._get_company(row["c_id"], row["name"], row["c_date"]),
+            row["l_id"],
+            row["position"],
+            row["location"],
+            row["url"],
+            row["alive"],
+            row["l_date"],
+            row["date_removed"],
         )
-        return [
-            models.Listing(
-                models.Company(datum["c_id"], datum["name"], datum["c_date"]),
-                datum["l_id"],
-                datum["position"],
-                datum["location"],
-                datum["url"],
-                datum["alive"],
-                datum["l_date"],
-                datum["date_removed"],
-            )
-            for datum in data
-        ]
+
+    def _execute(self, query: str, parameters: Sequence[Any] = ()) -> int:
+        """Execute `query` and return the number of affected rows."""
+        self.query(query, parameters)
+        return self.cursor.rowcount
+
+    def _executemany(self, query: str, parameters: Iterable[Sequence[Any]]) -> int:
+        """Execute `query` once for each set of `parameters`.
+
+        Returns the total number of affected rows."""
+        if not self.connected:
+            self.connect()
+        assert self.connection
+        self.cursor = self.connection.cursor()
+        self.cursor.executemany(query, parameters)
+        return self.cursor.rowcount
 
     def add_application(self, listing_id: int):
         """Add `listing_id` to `applications` table."""
@@ -69,7 +480,7 @@ class JobBased(Databased):
         self.add_company(company)
         company_id = None
         companies = self.select(
-            "companies", ["company_id"], where=f"name = '{company}'"
+            "companies", ["company_id"], where="name = ?", parameters=(company,)
         )
         if not companies:
             raise RuntimeError(
@@ -103,32 +514,128 @@ class JobBased(Databased):
             ],
         )
 
+    def add_listings(self, listings: Sequence[models.Listing]) -> int:
+        """Add `listings` to the `listings` table, ignoring any whose url is already in the table.
+
+        If `peruse_filters.toml` exists, the added listings are tagged with `tag_listings`.
+        If tagging fails, the listings are still added.
+        The `position_terms` statistics are updated with them, see `update_term_stats`.
+
+        Returns the number of listings added."""
+        last_id = self.query("SELECT MAX(listing_id) AS id FROM listings;")[0]["id"] or 0
+        added = self._executemany(
+            "INSERT OR IGNORE INTO listings (position, location, url, company_id, date_added) VALUES (?, ?, ?, ?, ?);",
+            [
+                (
+                    listing.position,
+                    listing.location,
+                    listing.url,
+                    listing.company.id,
+                    listing.date_added,
+                )
+                for listing in listings
+            ],
+        )
+        # New listings always get the largest ids
+        if added and config.peruse_filters_path.exists():
+            # Tagging failures are only logged; untagged listings get tagged by `peruse` instead
+            self.query("SAVEPOINT tag;")
+            try:
+                self.tag_listings(PeruseFilters.load(), "listing_id > ?", (last_id,))
+            except Exception:
+                self.logger.exception("Failed to tag added listings.")
+                self.query("ROLLBACK TO tag;")
+            self.query("RELEASE tag;")
+        if added:
+            self.update_term_stats()
+        return added
+
+    def add_saved_search(self, name: str, query: str) -> int:
+        """Save the FTS5 `query` as `name`, see `search_listings`.
+
+        Existing listings are tested against it the next time `run_saved_searches` is called.
+
+        Raises `sqlite3.OperationalError` if `query` isn't valid.
+
+        Returns the id of the saved search."""
+        # Running the query once surfaces any syntax errors before it's saved
+        self.query(
+            "SELECT rowid FROM listings_fts WHERE listings_fts MATCH ? LIMIT 1;", (query,)
+        )
+        self.query(
+            "INSERT INTO saved_searches (name, query, date_added) VALUES (?, ?, ?);",
+            (name, query, datetime.now()),
+        )
+        return self.cursor.lastrowid or -1
+
+    def delete_saved_search(self, name: str) -> int:
+        """Delete the saved search `name` along with its hits.
+
+        Returns the number of deleted searches."""
+        return self._execute("DELETE FROM saved_searches WHERE name = ?;", (name,))
+
     def get_active_boards(self) -> list[models.Board]:
         """Returns a list active boards."""
         return [board for board in self.get_boards() if board.active]
 
+    def _get_applications(
+        self, where: str = "1 = 1", parameters: Sequence[Any] = ()
+    ) -> list[models.Application]:
+        """Returns `models.Application` objects satisfying the given `where` clause."""
+        rows = self.query(
+            f"""
+            SELECT {listing_columns}, application_id, date_applied
+            FROM applications
+                INNER JOIN listings ON applications.listing_id = listings.listing_id
+                INNER JOIN companies ON listings.company_id = companies.company_id
+            WHERE {where} ORDER BY applications.listing_id;""",
+            parameters,
+        )
+        return [
+            models.Application(
+                self._listing_from_row(row), row["application_id"], row["date_applied"]
+            )
+            for row in rows
+        ]
+
     def get_applications(self) -> list[models.Application]:
         """Returns a list of `models.Application` objects from the database."""
-        applied_listings = self._get_listings(
-            "listing_id IN (SELECT listing_id FROM applications)", "listing_id"
+        return self._get_applications()
+
+    def _get_boards(
+        self, where: str = "1 = 1", parameters: Sequence[Any] = ()
+    ) -> list[models.Board]:
+        """Returns `models.Board` objects satisfying the given `where` clause."""
+        data = self.query(
+            f"""
+            SELECT
+                board_id, url, boards.date_added AS b_date, boards.company_id, name,
+                companies.date_added AS c_date, active
+            FROM boards INNER JOIN companies ON boards.company_id = companies.company_id
+            WHERE {where} ORDER BY board_id;""",
+            parameters,
         )
         return [
-            models.Application(listing, datum["application_id"], datum["date_applied"])
-            for datum, listing in zip(
-                self.select(
-                    "applications",
-                    ["application_id", "date_applied"],
-                    order_by="listing_id",
-                ),
-                applied_listings,
+            models.Board(
+                self._get_company(datum["company_id"], datum["name"], datum["c_date"]),
+                datum["board_id"],
+                datum["url"],
+                datum["active"],
+                datum["b_date"],
             )
+            for datum in data
         ]
 
     def get_board(self, company_name_stem: str) -> models.Board:
         """Returns a `model.Board` object from `company_name_stem`.
 
         Primarily used for getting `models.Board` using a scraper's file name."""
-        name = company_name_stem.replace("_", " ")
+        stem = helpers.name_to_stem(company_name_stem)
+        boards = self._get_boards("companies.stem = ?", (stem,))
+        if boards:
+            return boards[0]
+        # SQLite's `lower()` only handles ASCII, so names with other characters won't have a matching `stem`
+        name = stem.replace("_", " ")
         for board in self.get_boards():
             if board.company.name.lower() == name:
                 return board
@@ -136,37 +643,37 @@ class JobBased(Databased):
             f"Could not retrieve a board for company stem `{company_name_stem}`"
         )
 
+    def get_board_runtimes(self) -> dict[int, float]:
+        """Returns the average scrape duration, in seconds, of each board that's been timed, keyed by board id."""
+        return {
+            row["board_id"]: row["average_runtime"]
+            for row in self.query(
+                "SELECT board_id, average_runtime FROM board_state WHERE average_runtime IS NOT NULL;"
+            )
+        }
+
     def get_boards(self) -> list[models.Board]:
         """Returns a list of `models.Board` objects from the database."""
-        data = self.select(
-            "boards",
-            [
-                "board_id",
-                "url",
-                "boards.date_added AS b_date",
-                "boards.company_id",
-                "name",
-                "companies.date_added AS c_date",
-                "active",
-            ],
-            ["INNER JOIN companies ON boards.company_id = companies.company_id"],
-        )
-        return [
-            models.Board(
-                models.Company(datum["company_id"], datum["name"], datum["c_date"]),
-                datum["board_id"],
-                datum["url"],
-                datum["active"],
-                datum["b_date"],
-            )
-            for datum in data
-        ]
+        return self._get_boards()
+
+    def get_boards_from_stems(self, stems: Sequence[str]) -> dict[str, models.Board]:
+        """Returns a mapping of company stem to `models.Board` for each of `stems` found in the database.
+
+        If a company has more than one board, its first one is used, same as `get_board`."""
+        stems = [helpers.name_to_stem(stem) for stem in stems]
+        boards: dict[str, models.Board] = {}
+        if not stems:
+            return boards
+        placeholders = ", ".join("?" for _ in stems)
+        for board in self._get_boards(f"companies.stem IN ({placeholders})", stems):
+            boards.setdefault(helpers.name_to_stem(board.company.name), board)
+        return boards
 
     def get_companies(self) -> list[models.Company]:
         """Returns a list of `models.Company` objects from the database."""
         companies = self.select("companies", ["company_id", "name", "date_added"])
         return [
-            models.Company(
+            self._get_company(
                 company["company_id"], company["name"], company["date_added"]
             )
             for company in companies
@@ -174,22 +681,68 @@ class JobBased(Databased):
 
     def get_company_from_name(self, company_name: str) -> models.Company | None:
         """Returns a `models.Company` object from `company_name` (case insensitive) if it exists."""
-        try:
-            company = self.select("companies", where=f"name LIKE '{company_name}'")[0]
-        except Exception as e:
+        rows = self.query(
+            "SELECT company_id, name, date_added FROM companies WHERE name = ? COLLATE NOCASE;",
+            (company_name,),
+        )
+        if not rows:
             return None
-        return models.Company(
-            company["company_id"], company["name"], company["date_added"]
+        return self._get_company(
+            rows[0]["company_id"], rows[0]["name"], rows[0]["date_added"]
         )
 
     def get_company_names(self) -> list[str]:
         """A list of company names from the database."""
         return [company.name for company in self.get_companies()]
 
+    def get_content_hash(self, board_id: int) -> str | None:
+        """Returns the `content_hash` saved in `board_state` for `board_id`, if there is one."""
+        rows = self.query(
+            "SELECT content_hash FROM board_state WHERE board_id = ?;", (board_id,)
+        )
+        return rows[0]["content_hash"] if rows else None
+
+    def get_content_hashes(self) -> dict[int, str]:
+        """Returns the `content_hash` saved in `board_state` of each board that has one, keyed by board id."""
+        return {
+            row["board_id"]: row["content_hash"]
+            for row in self.query(
+                "SELECT board_id, content_hash FROM board_state WHERE content_hash IS NOT NULL;"
+            )
+        }
+
     def get_dead_listings(self) -> list[models.Listing]:
         """Returns a list of dead listings from the database."""
         return self._get_listings("alive = 0")
 
+    def get_due_boards(self, now: datetime) -> list[models.Board]:
+        """Returns active boards whose `next_due` time in `board_state` is at or before `now`,
+        along with any that haven't been scheduled yet."""
+        return self._get_boards(
+            "active = 1 AND board_id NOT IN (SELECT board_id FROM board_state WHERE next_due > ?)",
+            (now,),
+        )
+
+    def get_http_validators(
+        self, board_id: int | None = None
+    ) -> dict[int, dict[str, tuple[str | None, str | None]]]:
+        """Returns the saved `(etag, last_modified)` response headers of each url, keyed by board id and then url.
+
+        If `board_id` is given, only that board's are returned."""
+        where, parameters = (
+            ("WHERE board_id = ?", (board_id,)) if board_id is not None else ("", ())
+        )
+        validators: dict[int, dict[str, tuple[str | None, str | None]]] = {}
+        for row in self.query(
+            f"SELECT board_id, url, etag, last_modified FROM http_validators {where};",
+            parameters,
+        ):
+            validators.setdefault(row["board_id"], {})[row["url"]] = (
+                row["etag"],
+                row["last_modified"],
+            )
+        return validators
+
     def get_inactive_boards(self) -> list[models.Board]:
         """Returns a list of boards that have been deactivated (no longer scraped)."""
         return [board for board in self.get_boards() if not board.active]
@@ -198,14 +751,39 @@ class JobBased(Databased):
         """Returns a list of `models.Listing` objects from the database."""
         return self._get_listings()
 
+    def get_listings_by_company(
+        self,
+    ) -> MappingProxyType[int, tuple[models.Listing, ...]]:
+        """Returns a read only mapping of `company_id` to that company's listings."""
+        index: dict[int, list[models.Listing]] = {}
+        for listing in self.iter_listings():
+            index.setdefault(listing.company.id, []).append(listing)
+        return MappingProxyType(
+            {company_id: tuple(listings) for company_id, listings in index.items()}
+        )
+
     def get_live_applications(self) -> list[models.Application]:
         """Returns a list of applied for positions where the listing is still up."""
-        return [app for app in self.get_applications() if app.listing.alive]
+        return self._get_applications("listings.alive = 1")
 
     def get_live_listings(self) -> list[models.Listing]:
         """Returns a list of job listings that are still up."""
         return self._get_listings("alive = 1")
 
+    def get_next_due_time(self) -> datetime | None:
+        """Returns the earliest `next_due` time of any active board.
+
+        Returns `None` if an active board hasn't been scheduled yet, i.e. it's due now."""
+        row = self.query(
+            """
+            SELECT
+                COUNT(board_state.board_id) < COUNT(*) AS unscheduled,
+                MIN(board_state.next_due) AS "next_due [timestamp]"
+            FROM boards LEFT JOIN board_state ON boards.board_id = board_state.board_id AND board_state.next_due IS NOT NULL
+            WHERE boards.active = 1;"""
+        )[0]
+        return None if row["unscheduled"] else row["next_due"]
+
     def get_pinned_dead_listings(self) -> list[models.Listing]:
         """Returns a list of pinned listings that have been taken down."""
         return self._get_listings(
@@ -226,14 +804,68 @@ class JobBased(Databased):
 
     def get_rejections(self) -> list[models.Rejection]:
         """Returns a list of rejected applications."""
-        rejections = self.select("rejections", order_by="application_id")
-        ids = [rejection["application_id"] for rejection in rejections]
-        apps = [app for app in self.get_applications() if app.id in ids]
+        rows = self.query(
+            f"""
+            SELECT {listing_columns}, applications.application_id, date_applied, rejection_id, date_rejected
+            FROM rejections
+                INNER JOIN applications ON rejections.application_id = applications.application_id
+                INNER JOIN listings ON applications.listing_id = listings.listing_id
+                INNER JOIN companies ON listings.company_id = companies.company_id
+            ORDER BY applications.application_id;"""
+        )
+        return [
+            models.Rejection(
+                models.Application(
+                    self._listing_from_row(row),
+                    row["application_id"],
+                    row["date_applied"],
+                ),
+                row["rejection_id"],
+                row["date_rejected"],
+            )
+            for row in rows
+        ]
+
+    def get_saved_searches(self) -> list[models.SavedSearch]:
+        """Returns all saved searches."""
         return [
-            models.Rejection(app, row["rejection_id"], row["date_rejected"])
-            for app, row in zip(apps, rejections)
+            models.SavedSearch(
+                row["search_id"],
+                row["name"],
+                row["query"],
+                row["last_listing_id"],
+                row["date_added"],
+            )
+            for row in self.query("SELECT * FROM saved_searches ORDER BY name;")
         ]
 
+    def get_search_hit_counts(self) -> Rows:
+        """Returns the name, query, number of hits, and number of live, unseen hits of each saved search."""
+        return self.query(
+            """
+            SELECT
+                saved_searches.name,
+                saved_searches.query,
+                COUNT(listings.listing_id) AS hits,
+                COUNT(CASE WHEN listings.alive = 1 AND listings.listing_id NOT IN (SELECT listing_id FROM seen_listings) THEN 1 END) AS unseen
+            FROM saved_searches
+                LEFT JOIN search_hits ON saved_searches.search_id = search_hits.search_id
+                LEFT JOIN listings ON search_hits.listing_id = listings.listing_id
+            GROUP BY saved_searches.search_id
+            ORDER BY saved_searches.name;"""
+        )
+
+    def get_search_hits(
+        self, name: str, live_only: bool = True, unseen_only: bool = True
+    ) -> list[models.Listing]:
+        """Returns the listings found by the saved search `name`, newest first."""
+        where = "listings.listing_id IN (SELECT listing_id FROM search_hits WHERE search_id = (SELECT search_id FROM saved_searches WHERE name = ?))"
+        if live_only:
+            where += " AND alive = 1"
+        if unseen_only:
+            where += " AND listings.listing_id NOT IN (SELECT listing_id FROM seen_listings)"
+        return self._get_listings(where, "listings.listing_id DESC", (name,))
+
     def get_unseen_listings(self) -> list[models.Listing]:
         """Returns listings that haven't been viewed."""
         return self._get_listings(
@@ -248,24 +880,66 @@ class JobBased(Databased):
 
     def mark_applications_older_than_30days_as_rejected(self):
         """Mark any applications older than 30 days as rejected."""
-        rejected_application_ids = [
-            rejection.application.id for rejection in self.get_rejections()
-        ]
-        for application in self.get_applications():
-            if (
-                application.id not in rejected_application_ids
-                and (datetime.now() - application.date_applied).days > 30
-            ):
-                print(
-                    f"Marking application #{application.id} for listing '{application.listing.id}. {application.listing.position} -- {application.listing.company.name}' as rejected."
-                )
-                self.mark_rejected(application.id)
+        now = datetime.now()
+        # Equivalent to `(now - date_applied).days > 30`
+        where = "applications.application_id NOT IN (SELECT application_id FROM rejections) AND julianday(?) - julianday(date_applied) >= 31"
+        for application in self._get_applications(where, (now,)):
+            print(
+                f"Marking application #{application.id} for listing '{application.listing.id}. {application.listing.position} -- {application.listing.company.name}' as rejected."
+            )
+        self.query(
+            f"""
+            INSERT INTO rejections (application_id, date_rejected)
+            SELECT application_id, ? FROM applications WHERE {where};""",
+            (now, now),
+        )
 
     def mark_dead(self, listing_id: int):
         """Mark listing with `listing_id` as dead."""
-        self.update("listings", "alive", 0, f"listing_id = {listing_id}")
-        self.update(
-            "listings", "date_removed", datetime.now(), f"listing_id = {listing_id}"
+        self.query(
+            "UPDATE listings SET alive = 0, date_removed = ? WHERE listing_id = ?;",
+            (datetime.now(), listing_id),
+        )
+
+    def mark_dead_where(self, where: str, parameters: Sequence[Any] = ()) -> int:
+        """Mark every live listing satisfying the `where` clause as dead in one statement.
+
+        See `select_listing_ids` for what `where` can reference.
+
+        Returns the number of updated listings."""
+        return self._execute(
+            f"UPDATE listings SET alive = 0, date_removed = ? WHERE alive = 1 AND listing_id IN ({select_listing_ids(where)});",
+            (datetime.now(), *parameters),
+        )
+
+    def mark_listings_dead(self, listing_ids: Sequence[int]) -> int:
+        """Mark listings with `listing_ids` as dead.
+
+        Returns the number of updated listings."""
+        now = datetime.now()
+        return self._executemany(
+            "UPDATE listings SET alive = 0, date_removed = ? WHERE listing_id = ?;",
+            [(now, listing_id) for listing_id in listing_ids],
+        )
+
+    def mark_listings_seen(self, listing_ids: Sequence[int]) -> int:
+        """Add `listing_ids` to `seen_listings` table, skipping any that are already there.
+
+        Returns the number of listings added."""
+        return self._executemany(
+            "INSERT OR IGNORE INTO seen_listings (listing_id) VALUES (?);",
+            [(listing_id,) for listing_id in listing_ids],
+        )
+
+    def mark_seen_where(self, where: str, parameters: Sequence[Any] = ()) -> int:
+        """Add every listing satisfying the `where` clause to `seen_listings` table in one statement.
+
+        See `select_listing_ids` for what `where` can reference.
+
+        Returns the number of listings added."""
+        return self._execute(
+            f"INSERT OR IGNORE INTO seen_listings (listing_id) {select_listing_ids(where)};",
+            parameters,
         )
 
     def mark_rejected(self, application_id: int):
@@ -278,17 +952,101 @@ class JobBased(Databased):
 
     def mark_seen(self, listing_id: int):
         """Add `listing_id` to `seen_listings` table."""
-        self.insert("seen_listings", ("listing_id",), [(listing_id,)])
+        self.query("INSERT INTO seen_listings (listing_id) VALUES (?);", (listing_id,))
 
     def pin_listing(self, listing_id: int):
         """Add `listing_id` to `pinned_listings` table."""
-        self.insert("pinned_listings", ("listing_id",), [(listing_id,)])
+        self.query("INSERT INTO pinned_listings (listing_id) VALUES (?);", (listing_id,))
+
+    def pin_listings(self, listing_ids: Sequence[int]) -> int:
+        """Add `listing_ids` to `pinned_listings` table, skipping any that are already there.
+
+        Returns the number of listings added."""
+        return self._executemany(
+            "INSERT OR IGNORE INTO pinned_listings (listing_id) VALUES (?);",
+            [(listing_id,) for listing_id in listing_ids],
+        )
+
+    def pin_where(self, where: str, parameters: Sequence[Any] = ()) -> int:
+        """Add every listing satisfying the `where` clause to `pinned_listings` table in one statement.
+
+        See `select_listing_ids` for what `where` can reference.
+
+        Returns the number of listings added."""
+        return self._execute(
+            f"INSERT OR IGNORE INTO pinned_listings (listing_id) {select_listing_ids(where)};",
+            parameters,
+        )
 
     def reset_alive_status(self, listing_id: int):
         """Update a listing's `alive` column to `1` and `date_removed` column to `NULL`."""
-        self.update("listings", "alive", 1, f"listing_id = {listing_id}")
         self.query(
-            f"UPDATE listings SET date_removed = NULL WHERE listing_id = {listing_id};"
+            "UPDATE listings SET alive = 1, date_removed = NULL WHERE listing_id = ?;",
+            (listing_id,),
+        )
+
+    def reconcile_listings(
+        self, company_id: int, found_urls: Iterable[str], mark_dead: bool = True
+    ) -> tuple[list[int], list[int]]:
+        """Reconcile the listings for `company_id` against the full set of urls a scraper found.
+
+        In one transaction:
+        * live listings whose url isn't in `found_urls` are marked dead (unless `mark_dead` is `False`)
+        * dead listings whose url is in `found_urls` are resurrected
+
+        Returns a tuple of the ids of the listings marked dead and the ids of the listings resurrected."""
+        self.query("CREATE TEMP TABLE IF NOT EXISTS found_urls (url TEXT PRIMARY KEY);")
+        self.query("DELETE FROM temp.found_urls;")
+        self._executemany(
+            "INSERT OR IGNORE INTO temp.found_urls (url) VALUES (?);",
+            [(url,) for url in found_urls],
+        )
+        self.query(
+            "DELETE FROM seen_listings WHERE listing_id IN (SELECT listing_id FROM listings WHERE company_id = ? AND alive = 0 AND url IN (SELECT url FROM temp.found_urls)) AND listing_id NOT IN (SELECT listing_id FROM pinned_listings);",
+            (company_id,),
+        )
+        resurrected = [
+            row["listing_id"]
+            for row in self.query(
+                "UPDATE listings SET alive = 1, date_removed = NULL WHERE company_id = ? AND alive = 0 AND url IN (SELECT url FROM temp.found_urls) RETURNING listing_id;",
+                (company_id,),
+            )
+        ]
+        dead: list[int] = []
+        if mark_dead:
+            dead = [
+                row["listing_id"]
+                for row in self.query(
+                    "UPDATE listings SET alive = 0, date_removed = ? WHERE company_id = ? AND alive = 1 AND url NOT IN (SELECT url FROM temp.found_urls) RETURNING listing_id;",
+                    (datetime.now(), company_id),
+                )
+            ]
+        self.query("DELETE FROM temp.found_urls;")
+        return dead, resurrected
+
+    def record_board_runtimes(
+        self,
+        runtimes: dict[int, float],
+        weight: float = config.jobglob.runtime_weight,
+    ) -> int:
+        """Add the latest scrape durations, in seconds, keyed by board id, to each board's average runtime in `board_state`.
+
+        The average is exponentially weighted, `weight` being the weight of the latest duration.
+
+        Returns the number of updated boards."""
+        now = datetime.now()
+        return self._executemany(
+            """
+            INSERT INTO board_state (board_id, average_runtime, last_runtime, num_runs, last_scraped) VALUES (?, ?, ?, 1, ?)
+            ON CONFLICT (board_id) DO UPDATE SET
+                average_runtime = IFNULL(? * excluded.last_runtime + (1 - ?) * average_runtime, excluded.last_runtime),
+                last_runtime = excluded.last_runtime,
+                num_runs = num_runs + 1,
+                last_scraped = excluded.last_scraped;""",
+            [
+                (board_id, runtime, runtime, now, weight, weight)
+                for board_id, runtime in runtimes.items()
+            ],
         )
 
     def resurrect_listing(self, listing_id: int):
@@ -296,16 +1054,267 @@ class JobBased(Databased):
         self.reset_alive_status(listing_id)
         self.delete(
             "seen_listings",
-            f"listing_id = {listing_id} AND {listing_id} NOT IN (SELECT listing_id FROM pinned_listings)",
+            "listing_id = ? AND listing_id NOT IN (SELECT listing_id FROM pinned_listings)",
+            (listing_id,),
+        )
+
+    def resurrect_where(self, where: str, parameters: Sequence[Any] = ()) -> int:
+        """Resurrect every dead listing satisfying the `where` clause, same as `resurrect_listing`, in two statements.
+
+        See `select_listing_ids` for what `where` can reference.
+
+        Returns the number of resurrected listings."""
+        dead = f"alive = 0 AND listing_id IN ({select_listing_ids(where)})"
+        # Unsee them first, while they can still be told apart from listings that are already alive
+        self._execute(
+            f"DELETE FROM seen_listings WHERE listing_id IN (SELECT listing_id FROM listings WHERE {dead}) AND listing_id NOT IN (SELECT listing_id FROM pinned_listings);",
+            parameters,
+        )
+        return self._execute(
+            f"UPDATE listings SET alive = 1, date_removed = NULL WHERE {dead};",
+            parameters,
+        )
+
+    def retag_listings(self, filters: PeruseFilters, chunk_size: int = 5000) -> int:
+        """Tag the live, unseen listings whose tags are missing or weren't made with `filters`.
+
+        Listings are tagged and committed `chunk_size` at a time,
+        so the database isn't locked for the whole re-tag and an interrupted re-tag keeps its progress.
+
+        Returns the number of tagged listings."""
+        stale = "alive = 1 AND listing_id NOT IN (SELECT listing_id FROM seen_listings) AND listing_id NOT IN (SELECT listing_id FROM listing_tags WHERE version = ?)"
+        tagged = 0
+        last_id = 0
+        while True:
+            chunk_end = self.query(
+                f"SELECT MAX(listing_id) AS id FROM (SELECT listing_id FROM listings WHERE {stale} AND listing_id > ? ORDER BY listing_id LIMIT ?);",
+                (filters.version, last_id, chunk_size),
+            )[0]["id"]
+            if chunk_end is None:
+                return tagged
+            tagged += self.tag_listings(
+                filters,
+                f"{stale} AND listing_id BETWEEN ? AND ?",
+                (filters.version, last_id + 1, chunk_end),
+            )
+            self.commit()
+            last_id = chunk_end
+
+    def run_saved_searches(self) -> dict[str, int]:
+        """Test each saved search against the listings added since it was last run and record the matches in `search_hits`.
+
+        Only listings newer than a search's `last_listing_id` are tested,
+        so the cost depends on how many listings were added rather than how many there are.
+
+        Returns the number of new hits for each search."""
+        last_id = self.query("SELECT MAX(listing_id) AS id FROM listings;")[0]["id"] or 0
+        now = datetime.now()
+        hits: dict[str, int] = {}
+        for search in self.get_saved_searches():
+            if search.last_listing_id >= last_id:
+                hits[search.name] = 0
+                continue
+            # FTS5 uses the rowid range to skip to the new listings in each term's list of matches
+            hits[search.name] = self._execute(
+                "INSERT OR IGNORE INTO search_hits (search_id, listing_id, date_found) SELECT ?, rowid, ? FROM listings_fts WHERE listings_fts MATCH ? AND rowid > ? AND rowid <= ?;",
+                (search.id, now, search.query, search.last_listing_id, last_id),
+            )
+            self.query(
+                "UPDATE saved_searches SET last_listing_id = ? WHERE search_id = ?;",
+                (last_id, search.id),
+            )
+        return hits
+
+    def save_content_hash(self, board_id: int, content_hash: str) -> int:
+        """Save the hash of the response bodies from the latest scrape of `board_id`."""
+        return self._execute(
+            "INSERT INTO board_state (board_id, content_hash) VALUES (?, ?) ON CONFLICT (board_id) DO UPDATE SET content_hash = excluded.content_hash;",
+            (board_id, content_hash),
+        )
+
+    def save_http_validators(
+        self, board_id: int, validators: dict[str, tuple[str | None, str | None]]
+    ) -> int:
+        """Save the `(etag, last_modified)` response headers of each url in `validators` for `board_id`.
+
+        Returns the number of saved urls."""
+        now = datetime.now()
+        return self._executemany(
+            """
+            INSERT INTO http_validators (board_id, url, etag, last_modified, date_updated) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (board_id, url) DO UPDATE SET
+                etag = excluded.etag,
+                last_modified = excluded.last_modified,
+                date_updated = excluded.date_updated;""",
+            [
+                (board_id, url, etag, last_modified, now)
+                for url, (etag, last_modified) in validators.items()
+            ],
+        )
+
+    def search_listings(
+        self,
+        query: str,
+        live_only: bool = True,
+        unseen_only: bool = True,
+        order_by: str | None = "listings.listing_id",
+    ) -> list[models.Listing]:
+        """Returns listings whose position or location match the FTS5 `query`.
+
+        The index uses the trigram tokenizer, so a quoted term matches any listing containing it (case insensitive),
+        as long as it's at least `min_search_term_length` characters.
+        Use `to_search_query` to build a query from a list of terms.
+
+        >>> db.search_listings('position : ("python" OR "data") NOT location : "onsite"')
+        """
+        where = "listings.listing_id IN (SELECT rowid FROM listings_fts WHERE listings_fts MATCH ?)"
+        if live_only:
+            where += " AND alive = 1"
+        if unseen_only:
+            where += " AND listings.listing_id NOT IN (SELECT listing_id FROM seen_listings)"
+        return self._get_listings(where, order_by, (query,))
+
+    def tag_listings(
+        self,
+        filters: PeruseFilters,
+        where: str = "1 = 1",
+        parameters: Sequence[Any] = (),
+    ) -> int:
+        """Record which of `filters` each listing satisfying the `where` clause matches in the `listing_tags` table,
+        stamped with `filters.version`.
+
+        The filters are evaluated in SQL with `peruse_filters.like_any`, so `where` can only reference the `listings` table.
+        Values for any `?` placeholders in `where` can be given with `parameters`.
+
+        Returns the number of tagged listings."""
+        flags: list[str] = []
+        flag_parameters: list[str] = []
+        for column, terms in [
+            ("position", filters.position_filters),
+            ("location", filters.location_filters),
+            ("url", filters.url_filters),
+        ]:
+            clause, terms_ = like_any(column, terms)
+            flags.append(f"IFNULL(({clause}), 0)")
+            flag_parameters.extend(terms_)
+        # Without any default search terms, every listing is a match
+        clause, terms_ = (
+            like_any("position", filters.default_search)
+            if filters.default_search
+            else ("1", [])
+        )
+        flags.append(f"IFNULL(({clause}), 0)")
+        flag_parameters.extend(terms_)
+        return self._execute(
+            f"""
+            INSERT OR REPLACE INTO listing_tags (listing_id, version, position_filtered, location_filtered, url_filtered, default_search)
+            SELECT listing_id, ?, {", ".join(flags)} FROM listings WHERE {where};""",
+            (filters.version, *flag_parameters, *parameters),
+        )
+
+    def update_board_schedules(
+        self,
+        changes: dict[int, int],
+        min_interval: float = config.jobglob_daemon.glob_interval,
+        max_interval: float = config.jobglob_daemon.max_interval,
+        backoff: float = config.jobglob_daemon.backoff,
+        weight: float = config.jobglob.runtime_weight,
+    ) -> int:
+        """Schedule the next scrape of each board in `changes`, which were just scraped, in `board_state`.
+
+        `changes` is the number of listings each board's scrape added, marked dead, or resurrected, keyed by board id.
+        If a board changed, its interval is divided by `backoff`, otherwise it's multiplied by `backoff`,
+        keeping it between `min_interval` and `max_interval` seconds.
+        `change_rate` is updated with the number of changes, `weight` being the weight of the latest count.
+
+        Returns the number of scheduled boards."""
+        if not changes:
+            return 0
+        previous = {
+            row["board_id"]: row
+            for row in self.query(
+                f"SELECT board_id, change_rate, scrape_interval FROM board_state WHERE board_id IN ({', '.join('?' * len(changes))});",
+                list(changes),
+            )
+        }
+        now = datetime.now()
+        schedules: list[tuple[int, float, float, datetime]] = []
+        for board_id, count in changes.items():
+            row = previous.get(board_id)
+            interval = (row and row["scrape_interval"]) or min_interval
+            interval = (
+                max(min_interval, interval / backoff)
+                if count
+                else min(max_interval, interval * backoff)
+            )
+            change_rate = (
+                count
+                if not row or row["change_rate"] is None
+                else weight * count + (1 - weight) * row["change_rate"]
+            )
+            schedules.append(
+                (board_id, change_rate, interval, now + timedelta(seconds=interval))
+            )
+        return self._executemany(
+            """
+            INSERT INTO board_state (board_id, change_rate, scrape_interval, next_due) VALUES (?, ?, ?, ?)
+            ON CONFLICT (board_id) DO UPDATE SET
+                change_rate = excluded.change_rate,
+                scrape_interval = excluded.scrape_interval,
+                next_due = excluded.next_due;""",
+            schedules,
         )
 
     def update_board_url(self, board_id: int, url: str) -> int:
         """Update board with id `board_id` to `url`.
 
         Returns the number of updated records."""
-        return self.update("boards", "url", url, f"board_id = {board_id}")
+        return self.update("boards", "url", url, "board_id = ?", (board_id,))
+
+    def update_term_stats(self) -> int:
+        """Add the position terms of listings added since `position_terms` was last updated to it.
+
+        Doesn't commit, so it can be part of the transaction that added the listings.
+
+        Returns the number of listings counted."""
+        state = self.query(
+            "SELECT last_listing_id, document_count, total_length FROM position_terms_state;"
+        )[0]
+        last_id, num_documents, total_length = (
+            state["last_listing_id"],
+            state["document_count"],
+            state["total_length"],
+        )
+        assert self.connection
+        cursor = self.connection.cursor()
+        cursor.row_factory = None
+        cursor.execute(
+            "SELECT listing_id, position FROM listings WHERE listing_id > ? ORDER BY listing_id;",
+            (last_id,),
+        )
+        document_counts: Counter[str] = Counter()
+        counted = 0
+        for listing_id, position in cursor:
+            terms = helpers.tokenize(position or "")
+            document_counts.update(set(terms))
+            total_length += len(terms)
+            counted += 1
+            last_id = listing_id
+        cursor.close()
+        if counted:
+            self._executemany(
+                "INSERT INTO position_terms (term, document_count) VALUES (?, ?) ON CONFLICT (term) DO UPDATE SET document_count = document_count + excluded.document_count;",
+                document_counts.items(),
+            )
+            self.query(
+                "UPDATE position_terms_state SET last_listing_id = ?, document_count = ?, total_length = ?;",
+                (last_id, num_documents + counted, total_length),
+            )
+        return counted
 
     def get_scrapers_from_companies(self, companies: list[str]) -> Rows:
         """Return rows from `scrapers` view for `companies`."""
-        companies_ = "'" + "','".join(companies) + "'"
-        return self.select("scrapers", where=f"company in ({companies_})")
+        placeholders = ", ".join("?" for _ in companies)
+        return self.select(
+            "scrapers", where=f"company IN ({placeholders})", parameters=companies
+        )
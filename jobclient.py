@@ -0,0 +1,210 @@
+"""Shared asynchronous HTTP client for the "async" `JobGlob` engine.
+
+Scrapers still run their (synchronous) `get_source` methods in worker threads,
+but `JobGruel.request` hands the actual request off to a single `aiohttp` session
+running on a background event loop.
+The session's connector enforces the global and per host connection caps.
+"""
+
+import asyncio
+import logging
+import threading
+from datetime import timedelta
+from typing import Any
+
+import aiohttp
+import gruel
+import loggi
+import requests.structures
+from noiftimer import Timer
+from typing_extensions import Self
+from whosyouragent import whosyouragent
+
+retry_on_codes = [408, 413, 444, 499, 500, 502, 503, 504]
+
+# `gruel.request` keyword arguments that have an `aiohttp` equivalent.
+# Requests using anything else fall back to `gruel.request`.
+supported_kwargs = ["params", "data", "json", "headers", "allow_redirects", "timeout"]
+
+
+class AsyncClient:
+    """Run an `aiohttp.ClientSession` on a background event loop that can be shared between threads.
+
+    >>> with AsyncClient() as client:
+    >>>     response = client.request("https://boards.greenhouse.io/company")
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_connections_per_host: int = 8,
+        timeout: float = 10,
+    ):
+        """
+        :params:
+        * `max_connections`: The maximum number of simultaneous connections.
+        * `max_connections_per_host`: The maximum number of simultaneous connections to the same host.
+        * `timeout`: The default number of seconds before a request times out.
+        """
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.session: aiohttp.ClientSession | None = None
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any, **kwargs: Any):
+        self.close()
+
+    @property
+    def running(self) -> bool:
+        """Whether the event loop thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the event loop thread and open the session."""
+        if self.running:
+            return
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="jobclient", daemon=True
+        )
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._open_session(), self.loop).result()
+
+    def close(self):
+        """Close the session and stop the event loop thread."""
+        if not (self.loop and self._thread):
+            return
+        asyncio.run_coroutine_threadsafe(self._close_session(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+        self.loop = None
+        self._thread = None
+
+    async def _open_session(self):
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+            ),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+
+    async def _close_session(self):
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    async def _to_response(
+        self, response: aiohttp.ClientResponse, elapsed: float
+    ) -> gruel.Response:
+        """Convert an `aiohttp.ClientResponse` into a `gruel.Response`."""
+        converted = gruel.Response()
+        converted._content = await response.read()
+        converted.status_code = response.status
+        converted.headers = requests.structures.CaseInsensitiveDict(response.headers)
+        converted.url = str(response.url)
+        converted.reason = response.reason or ""
+        converted.encoding = response.charset
+        converted.elapsed = timedelta(seconds=elapsed)
+        for redirect in response.history:
+            previous = gruel.Response()
+            previous.status_code = redirect.status
+            previous.url = str(redirect.url)
+            previous.headers = requests.structures.CaseInsensitiveDict(
+                redirect.headers
+            )
+            converted.history.append(previous)
+        return converted
+
+    async def arequest(
+        self,
+        url: str,
+        method: str = "get",
+        randomize_useragent: bool = True,
+        retry_count: int = 3,
+        retry_backoff_factor: float = 0.1,
+        retry_on_codes: list[int] = retry_on_codes,
+        logger: loggi.Logger | logging.Logger | None = None,
+        **kwargs: Any,
+    ) -> gruel.Response:
+        """Coroutine version of `gruel.request` using this client's session."""
+        assert self.session
+        headers = dict(kwargs.pop("headers", None) or {})
+        if randomize_useragent and "User-Agent" not in headers:
+            # `get_agent` blocks, so keep it off the event loop
+            headers["User-Agent"] = await asyncio.to_thread(whosyouragent.get_agent)
+        timeout = kwargs.pop("timeout", None)
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+        method = method.upper()
+        attempt = 0
+        while True:
+            if logger:
+                logger.info(f"Sending a `{method}` request to `{url}`.")
+            timer = Timer().start()
+            try:
+                async with self.session.request(
+                    method, url, headers=headers, **kwargs
+                ) as response:
+                    converted = await self._to_response(response, timer.elapsed)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt < retry_count:
+                    await asyncio.sleep(retry_backoff_factor * (2**attempt))
+                    attempt += 1
+                    continue
+                if logger:
+                    logger.exception(f"`{method}` request to `{url}` failed.")
+                raise e
+            if converted.status_code in retry_on_codes and attempt < retry_count:
+                await asyncio.sleep(retry_backoff_factor * (2**attempt))
+                attempt += 1
+                continue
+            if logger:
+                logged_response = converted
+                for response_ in converted.history:
+                    if response_.url == url:
+                        logged_response = response_
+                        break
+                logger.info(
+                    f"Request to `{url}` completed with status code `{logged_response.status_code}` in {Timer.format_time(converted.elapsed.total_seconds(), True)}."
+                )
+            return converted
+
+    def request(self, url: str, method: str = "get", **kwargs: Any) -> gruel.Response:
+        """Make a request through the shared session from any thread and wait for the response.
+
+        Takes the same arguments as `gruel.request`.
+        If any of the arguments can't be translated to `aiohttp`, the request is made with `gruel.request` instead.
+        """
+        request_kwargs = {
+            key: value
+            for key, value in kwargs.items()
+            if key
+            not in [
+                "randomize_useragent",
+                "retry_count",
+                "retry_backoff_factor",
+                "retry_on_codes",
+                "logger",
+            ]
+        }
+        if not self.loop or any(
+            key not in supported_kwargs for key in request_kwargs
+        ):
+            return gruel.request(url, method, **kwargs)
+        if kwargs.get("randomize_useragent", True):
+            # Pick the user agent in the calling thread instead of on the shared event loop
+            headers = dict(kwargs.get("headers") or {})
+            if "User-Agent" not in headers:
+                headers["User-Agent"] = whosyouragent.get_agent()
+                kwargs["headers"] = headers
+        return asyncio.run_coroutine_threadsafe(
+            self.arequest(url, method, **kwargs), self.loop
+        ).result()
@@ -1,8 +1,14 @@
+import heapq
+import multiprocessing
+import os
 import random
+import statistics
+import time
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import asdict
 from datetime import datetime, timedelta
-from typing import Any, Type
+from typing import Any, Iterable, Sequence, Type
 
 import loggi
 import quickpool
@@ -20,6 +26,8 @@ import models
 from board_detector import BoardDetector
 from config import Config
 from jobbased import JobBased
+from jobclient import AsyncClient
+from jobwriter import ListingWriter
 
 root = Pathier(__file__).parent
 config = Config.load()
@@ -90,31 +98,119 @@ class ScraperLoader:
         )  # type: ignore
 
     def load_active_scrapers(
-        self,
+        self, due_only: bool = False
     ) -> deque[tuple[models.Board, Type[jobgruel.JobGruel]]]:
         """Get active scrapers from the database and determine their corresponding `JobGruel` subclass.
 
+        If `due_only` is `True`, only boards that are due to be scraped are loaded, see `JobBased.get_due_boards`.
+
         Returns a list of tuples where each tuple consists of the board and the class.
         """
         with JobBased() as db:
-            boards = db.get_active_boards()
+            boards = (
+                db.get_due_boards(datetime.now()) if due_only else db.get_active_boards()
+            )
+            runtimes = db.get_board_runtimes()
+        # Boards with the same estimate still get spread out
         random.shuffle(boards)
-        scrapers: deque[tuple[models.Board, Type[jobgruel.JobGruel]]] = deque()
+        scrapers: list[tuple[models.Board, Type[jobgruel.JobGruel]]] = []
         for board in boards:
             scraper_class = self.get_scraper_class(board)
             if scraper_class:
                 scrapers.append((board, scraper_class))
             else:
                 self.logger.error(f"No scraper class found for `{board}`.")
-        return scrapers
+        # Longest first, so a slow board doesn't start near the end and hold up the whole glob
+        estimates = estimate_runtimes(scrapers, runtimes)
+        order = sorted(range(len(scrapers)), key=lambda i: estimates[i], reverse=True)
+        return deque(scrapers[i] for i in order)
+
+
+def estimate_runtimes(
+    scrapers: Sequence[tuple[models.Board, Type[Gruel]]], runtimes: dict[int, float]
+) -> list[float]:
+    """Returns the expected scrape duration, in seconds, of each `(board, scraper class)` in `scrapers`.
+
+    `runtimes` has the average durations of boards that have been timed, keyed by board id.
+    Boards that haven't been get the average of timed boards with the same scraper class,
+    or the median of all timed boards if there aren't any."""
+    by_class: dict[str, list[float]] = {}
+    for board, scraper_class in scrapers:
+        if board.id in runtimes:
+            by_class.setdefault(scraper_class.__name__, []).append(runtimes[board.id])
+    fallback = statistics.median(runtimes.values()) if runtimes else 0.0
+    return [
+        runtimes.get(
+            board.id,
+            statistics.fmean(by_class[scraper_class.__name__])
+            if scraper_class.__name__ in by_class
+            else fallback,
+        )
+        for board, scraper_class in scrapers
+    ]
+
+
+def predict_makespan(durations: Iterable[float], num_workers: int) -> float:
+    """Returns how long jobs taking `durations` seconds, started in the given order, take to finish on `num_workers` workers,
+    each worker starting the next job as soon as it's free."""
+    finish_times = [0.0] * max(num_workers, 1)
+    for duration in durations:
+        heapq.heapreplace(finish_times, finish_times[0] + duration)
+    return max(finish_times)
+
+
+def load_scraper_modules(files: list[Pathier]):
+    """Import scraper files so the classes they define can be unpickled in a worker process."""
+    finder = GruelFinder(log_dir=config.logs_dir)
+    for file in files:
+        finder.load_module_from_file(file)
 
 
 class JobGlob(Brewer):
+    @property
+    def engine(self) -> str:
+        """The scraping engine to use, either "threads" or "async"."""
+        return config.jobglob.engine
+
+    @property
+    def parse_processes(self) -> int:
+        """The number of worker processes to parse sources in.
+
+        If `0`, sources are parsed in the thread that fetched them."""
+        return config.jobglob.parse_processes
+
+    @property
+    def num_workers(self) -> int:
+        """The number of scrapers run at once."""
+        if self.engine == "async":
+            # Worker threads only wait on the shared client,
+            # so there's no point in having more of them than connections
+            return config.jobglob.max_connections
+        # `ThreadPoolExecutor`'s default
+        return min(32, (os.cpu_count() or 1) + 4)
+
     @override
     def prescrape_chores(self):
         with JobBased() as db:
             self.num_listings = db.count("listings")
+            runtimes = db.get_board_runtimes()
+        self.predicted_makespan = predict_makespan(
+            estimate_runtimes(
+                [
+                    (kwargs["board"], scraper)
+                    for scraper, kwargs in zip(self.scrapers, self.scraper_kwargs)
+                    if "board" in kwargs
+                ],
+                runtimes,
+            ),
+            self.num_workers,
+        )
+        self.runtimes: dict[int, float] = {}
+        self.changes: dict[int, int] = {}
+        self.unchanged_boards: set[int] = set()
         self.start_time = datetime.now()
+        self.writer = ListingWriter()
+        self.writer.start()
 
     def group_by_company(self, listings: list[models.Listing]) -> dict[str, list[str]]:
         """Returns listing positions grouped by company."""
@@ -130,7 +226,7 @@ class JobGlob(Brewer):
         """Print listings added to the database since the start of the last scrape."""
         with JobBased() as db:
             new_listings = db._get_listings(
-                where=f"listings.date_added >= '{self.start_time}'"
+                "listings.date_added >= ?", parameters=(self.start_time,)
             )
             num_new_listings = len(new_listings)
             self.logger.info(f"Added {num_new_listings} new listings")
@@ -147,33 +243,36 @@ class JobGlob(Brewer):
 
     def check_dead_listings(self):
         """Check for listings marked dead between the start of the glob and now."""
-        with JobBased() as db:
-            listings = db.get_dead_listings()
-            pinned_listings = db.get_pinned_dead_listings()
         # 5s buffer to account for potential time diffs
         start_time = self.start_time - timedelta(seconds=5)
-        listings = [
-            listing
-            for listing in listings
-            if listing.date_removed and start_time < listing.date_removed
-        ]
-        self.logger.logprint(f"Found {len(listings)} dead listings.")
-        dead_pinned_listings: list[dict[str, str | int]] = []
-        listing_ids = [listing.id for listing in listings]
-        for listing in pinned_listings:
-            if listing.id in listing_ids:
-                dead_pinned_listings.append(
-                    {
-                        "id": listing.id,
-                        "position": listing.position,
-                        "company": listing.company.name,
-                        "url": listing.url,
-                    }
+        where = "alive = 0 AND date_removed > ?"
+        with JobBased() as db:
+            num_dead = db.count("listings", where=where, parameters=(start_time,))
+            dead_pinned_listings: list[dict[str, str | int]] = [
+                {
+                    "id": listing.id,
+                    "position": listing.position,
+                    "company": listing.company.name,
+                    "url": listing.url,
+                }
+                for listing in db.iter_listings(
+                    f"{where} AND listing_id IN (SELECT listing_id FROM pinned_listings)",
+                    parameters=(start_time,),
                 )
+            ]
+        self.logger.logprint(f"Found {num_dead} dead listings.")
         if dead_pinned_listings:
             print("Dead pinned listings:")
             print(griddy(dead_pinned_listings, "keys"))
 
+    def check_saved_searches(self):
+        """Test saved searches against the listings added by this glob and logprint the new hits."""
+        with JobBased() as db:
+            hits = db.run_saved_searches()
+        for name, count in hits.items():
+            if count:
+                self.logger.logprint(f"Saved search `{name}` found {count} new listings.")
+
     def check_resurrected_listings(self):
         """Check for resurrected listings and logprint the findings."""
         count = logglob.get_resurrected_listings_count(
@@ -182,6 +281,13 @@ class JobGlob(Brewer):
         if count:
             self.logger.logprint(f"Resurrected {count} listings.")
 
+    def logprint_unchanged_boards(self):
+        """Logprint how many boards hadn't changed since their last scrape, see `JobGruel._fetch_and_parse`."""
+        if self.unchanged_boards:
+            self.logger.logprint(
+                f"{len(self.unchanged_boards)} boards unchanged since their last scrape."
+            )
+
     def logprint_errors(self):
         """Print and log scrapers that had errors grouped by error type."""
         errors = logglob.get_scrapers_with_errors(self.start_time)
@@ -195,9 +301,28 @@ class JobGlob(Brewer):
                     self.logger.logprint(message)
                     print()
 
+    def record_runtimes(self):
+        """Save how long each parsed board took to scrape and logprint the predicted and actual time spent scraping."""
+        with JobBased() as db:
+            db.record_board_runtimes(self.runtimes)
+        self.logger.logprint(
+            f"Scraping took {Timer.format_time(self.scrape_time)} (predicted {Timer.format_time(self.predicted_makespan)})."
+        )
+
+    def update_board_schedules(self):
+        """Schedule the next scrape of each successfully scraped board based on whether it changed during this glob."""
+        with JobBased() as db:
+            db.update_board_schedules(self.changes)
+
     @override
     def postscrape_chores(self):
+        # Make sure every scraper's writes are committed before reporting on them
+        self.writer.close()
+        self.record_runtimes()
+        self.update_board_schedules()
         self.print_new_listings()
+        self.logprint_unchanged_boards()
+        self.check_saved_searches()
         self.logprint_errors()
         self.check_dead_listings()
         self.check_resurrected_listings()
@@ -209,10 +334,53 @@ class JobGlob(Brewer):
     @override
     def scrape(self) -> list[Any]:
         with JobBased() as db:
-            listings = db.get_listings()
+            listings = db.get_listings_by_company()
+            validators = db.get_http_validators()
+            content_hashes = db.get_content_hashes()
+        client = (
+            AsyncClient(
+                config.jobglob.max_connections,
+                config.jobglob.max_connections_per_host,
+            )
+            if self.engine == "async"
+            else None
+        )
+        parse_pool = (
+            ProcessPoolExecutor(
+                self.parse_processes,
+                # Forking while scraper threads hold locks can deadlock the workers
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=load_scraper_modules,
+                initargs=(list(config.scrapers_dir.glob("*.py")),),
+            )
+            if self.parse_processes
+            else None
+        )
+        # One pool for every paginated board's page requests instead of one per board
+        page_executor = ThreadPoolExecutor(
+            config.jobglob.page_workers, thread_name_prefix="pages"
+        )
 
         def execute(scraper: Type[jobgruel.JobGruel], kwargs: dict[str, Any]):
-            scraper(listings, **kwargs).scrape()
+            start = time.perf_counter()
+            instance = scraper(listings, **kwargs)
+            instance.client = client
+            instance.parse_pool = parse_pool
+            instance.page_executor = page_executor
+            instance.writer = self.writer
+            instance.validators = validators.get(instance.board.id, {})
+            instance.last_content_hash = content_hashes.get(instance.board.id, "")
+            try:
+                instance.scrape()
+            finally:
+                if instance.unchanged:
+                    self.unchanged_boards.add(instance.board.id)
+                # Failed boards keep their current schedule instead of looking unchanged
+                if "board" in kwargs and instance.succeeded:
+                    # Skipped and failed boards take a fraction of their usual time, so they'd drag their average runtime down
+                    if not instance.unchanged:
+                        self.runtimes[kwargs["board"].id] = time.perf_counter() - start
+                    self.changes[kwargs["board"].id] = instance.num_changes
 
         pool = quickpool.ThreadPool(
             [execute] * len(self.scrapers),
@@ -220,13 +388,25 @@ class JobGlob(Brewer):
                 (scraper, kwargs)
                 for scraper, kwargs in zip(self.scrapers, self.scraper_kwargs)
             ],
+            max_workers=self.num_workers,
         )
-        return pool.execute()
+        start = time.perf_counter()
+        try:
+            if not client:
+                return pool.execute()
+            with client:
+                return pool.execute()
+        finally:
+            self.scrape_time = time.perf_counter() - start
+            if parse_pool:
+                parse_pool.shutdown()
+            page_executor.shutdown()
 
 
-def main():
+def main(due_only: bool = False):
+    """Scrape every active board, or only the boards that are due if `due_only` is `True`."""
     loader = ScraperLoader()
-    scrapers = loader.load_active_scrapers()
+    scrapers = loader.load_active_scrapers(due_only)
     classes: deque[type[jobgruel.JobGruel]] = deque()
     kwargs: deque[dict[str, models.Board]] = deque()
     for scraper in scrapers:
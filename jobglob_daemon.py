@@ -8,6 +8,7 @@ from printbuddies import print_in_place
 
 import jobglob
 from config import Config
+from jobbased import JobBased
 
 config = Config.load()
 root = Pathier(__file__).parent
@@ -16,7 +17,9 @@ root = Pathier(__file__).parent
 class JobGlobDaemon:
     """Daemonize running `jobglob.py`.
 
-    Runs once an hour Monday -> Friday between 7 am and 7 pm.
+    Runs at most once an hour Monday -> Friday between 7 am and 7 pm.
+    Each run only scrapes the boards that are due: boards that keep changing are due every run,
+    boards that haven't changed in a while are scraped less and less often (see `JobBased.update_board_schedules`).
 
     Use `jobglob.py` to run ad hoc.
     """
@@ -84,6 +87,15 @@ class JobGlobDaemon:
         """The number of seconds since the last time `jobglob.JobGlob().brew()` was run."""
         return (datetime.now() - self.last_glob_time).total_seconds()
 
+    @property
+    def seconds_until_boards_due(self) -> float:
+        """The number of seconds until the next board is due to be scraped."""
+        with JobBased() as db:
+            next_due = db.get_next_due_time()
+        if not next_due:
+            return 0
+        return (next_due - datetime.now()).total_seconds()
+
     @property
     def seconds_until_business_hours(self) -> float:
         """The number of seconds between now and the next business hours window (according to `self.business_hours`)."""
@@ -113,7 +125,10 @@ class JobGlobDaemon:
             return self.seconds_until_monday_business_start
         if not self.is_business_hours:
             return self.seconds_until_business_hours
-        return self.glob_interval - self.seconds_since_last_glob
+        return max(
+            self.glob_interval - self.seconds_since_last_glob,
+            self.seconds_until_boards_due,
+        )
 
     def nap(self):
         """Sleep until next glob.
@@ -128,7 +143,7 @@ class JobGlobDaemon:
         while True:
             self.nap()
             print(f"Brewing at {datetime.now():%m/%d %I:%M %p}")
-            jobglob.main()
+            jobglob.main(due_only=True)
             self.last_glob_time = datetime.now()
 
 
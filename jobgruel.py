@@ -1,16 +1,24 @@
+import abc
+import hashlib
 import json
+import math
+from collections import deque
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
 from datetime import datetime
 from functools import cached_property
 
 import gruel
 from bs4 import ResultSet, Tag
 from pathier import Pathier
-from typing_extensions import Any, Callable, Sequence, override
+from typing_extensions import Any, Mapping, Sequence, override
 
 import helpers
 import models
 from config import Config
 from jobbased import JobBased
+from jobclient import AsyncClient
+from jobwriter import ListingWriter
 
 root = Pathier(__file__).parent
 
@@ -47,10 +55,17 @@ class JobGruel(gruel.Gruel):
     @override
     def __init__(
         self,
-        existing_listings: list[models.Listing] | None = None,
+        existing_listings: Mapping[int, Sequence[models.Listing]] | None = None,
         company_stem: str | None = None,  # don't need this if `board` is provided
         board: models.Board | None = None,
     ):
+        """
+        :params:
+        * `existing_listings`: Listings already in the database keyed by `company_id`, i.e. `JobBased.get_listings_by_company()`.
+        If `None`, this scraper's listings will be loaded from the database.
+        * `company_stem`: The company stem used to look up this scraper's board if `board` isn't given.
+        * `board`: The board this scraper is for.
+        """
         super().__init__(
             helpers.name_to_stem(board.company.name) if board else company_stem,
             log_dir=config.scraper_logs_dir,
@@ -59,104 +74,378 @@ class JobGruel(gruel.Gruel):
         db = JobBased(commit_on_close=False)
         self.board = board if board else db.get_board(self.name)
         listings = (
-            [
-                listing
-                for listing in existing_listings
-                if listing.company.id == self.board.company.id
-            ]
-            if existing_listings
-            else db._get_listings(f"listings.company_id = {self.board.company.id}")
+            existing_listings.get(self.board.company.id, ())
+            if existing_listings is not None
+            else db._get_listings(
+                "listings.company_id = ?", parameters=(self.board.company.id,)
+            )
         )
         db.close()
         self.existing_listings = listings
-        self.existing_listing_urls = [listing.url for listing in listings]
+        self.existing_listing_urls = {listing.url: listing for listing in listings}
         self.already_added_listings = 0
         self.new_listings = 0
+        self.dead_listings = 0
+        self.resurrected_listings = 0
+        # Set by `JobGlob` when using the "async" engine
+        self.client: AsyncClient | None = None
+        # Set by `JobGlob` when parsing is pipelined into worker processes
+        self.parse_pool: Executor | None = None
+        # Set by `JobGlob` so paginated boards share one pool of threads for requesting pages
+        self.page_executor: Executor | None = None
+        # Set by `JobGlob` so all scrapers' database writes go through one connection
+        self.writer: ListingWriter | None = None
+        # Set by `JobGlob` so validators aren't queried once per scraper,
+        # otherwise loaded from the database by `request_if_modified`
+        self.validators: dict[str, tuple[str | None, str | None]] | None = None
+        # Set by `JobGlob`, to "" if the board has no saved hash, so hashes aren't queried once per scraper,
+        # otherwise loaded from the database by `_fetch_and_parse`
+        self.last_content_hash: str | None = None
+        # Set if the board responds with a 304 or its content hashes the same as last scrape
+        self.unchanged = False
+        self.content_hash: str | None = None
+        self.source_failed = False
+        self.write_failed = False
+        self._new_validators: dict[str, tuple[str | None, str | None]] = {}
+
+    @property
+    def num_changes(self) -> int:
+        """The number of listings this scrape added, marked dead, or resurrected."""
+        return self.new_listings + self.dead_listings + self.resurrected_listings
+
+    @property
+    def succeeded(self) -> bool:
+        """`True` if the source was fetched and parsed without failures and every database write went through."""
+        return not (self.source_failed or self.had_failures or self.write_failed)
 
     def new_listing(self) -> models.Listing:
         """Returns a `models.Listing` object that is only populated with this scraper's company model."""
         return models.Listing(self.board.company)
 
+    @override
+    def request(self, *args: Any, **kwargs: Any) -> gruel.Response:
+        """Send a request through `self.client` if one is set, otherwise fall back to `gruel.request`.
+
+        Subclasses don't need to know which engine is running them."""
+        if not self.client:
+            return super().request(*args, **kwargs)
+        kwargs["logger"] = self.logger
+        return self.client.request(*args, **kwargs)
+
+    def request_if_modified(
+        self, url: str, method: str = "get", **kwargs: Any
+    ) -> gruel.Response:
+        """Send a conditional request for `url` with the `ETag` and `Last-Modified` headers it responded with last scrape.
+
+        If the response is a 304, `self.unchanged` is set and parsing, storing, and reconciling listings are skipped.
+        Otherwise, the response's validators are saved once the scrape finishes without failures.
+
+        Only meant for scrapers whose source is a single response."""
+        if self.validators is None:
+            with JobBased() as db:
+                self.validators = db.get_http_validators(self.board.id).get(
+                    self.board.id, {}
+                )
+        etag, last_modified = self.validators.get(url, (None, None))
+        headers = dict(kwargs.pop("headers", None) or {})
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        response = self.request(url, method, headers=headers, **kwargs)
+        if response.status_code == 304:
+            self.unchanged = True
+        elif response.ok:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self._new_validators[url] = (etag, last_modified)
+        return response
+
+    @override
+    def _fetch_and_parse(self):
+        """Skip parsing if the board hasn't changed since the last scrape.
+
+        A board is unchanged if it responded with a 304 to `request_if_modified`
+        or if its response bodies hash the same as they did after the last successful scrape."""
+        try:
+            source = self.get_source()
+        except Exception:
+            self.source_failed = True
+            self.logger.exception("Error getting source data.")
+            return
+        if not self.unchanged:
+            self.content_hash = hash_source(source)
+            if self.content_hash:
+                if self.last_content_hash is None:
+                    with JobBased() as db:
+                        self.last_content_hash = db.get_content_hash(self.board.id)
+                self.unchanged = self.content_hash == self.last_content_hash
+        if self.unchanged:
+            self.logger.info("Board unchanged since the last scrape.")
+        else:
+            self._parse_source(source)
+
+    @override
+    def _parse_source(self, source: Any):
+        """Parse `source` in `self.parse_pool` if one is set, otherwise in this thread.
+
+        If `source` can't be sent to the pool, it will be parsed in this thread."""
+        if not self.parse_pool:
+            return super()._parse_source(source)
+        try:
+            result = self.parse_pool.submit(
+                parse_source, type(self), self.board, to_picklable(source)
+            ).result()
+        except Exception:
+            self.logger.exception("Could not parse source in worker process.")
+            return super()._parse_source(source)
+        self.parsed_items = result.parsed_items
+        self.success_count += result.success_count
+        self.fail_count += result.fail_count
+        self.failed_to_get_parsable_items = result.failed_to_get_parsable_items
+
+    def _write(self, method: str, *args: Any) -> Any:
+        """Apply a write with `self.writer`, if set, or with a new connection.
+
+        `method` is the name of a `ListingWriter`/`JobBased` method and `args` are passed to it."""
+        if self.writer:
+            return getattr(self.writer, method)(*args).result()
+        with JobBased() as db:
+            return getattr(db, method)(*args)
+
     @override
     def store_items(self, items: Sequence[models.Listing | None]):
         """Add listings to the database if it doesn't already exist (based off `listing.url`)."""
+        new_listings: list[models.Listing] = []
         for item in items:
             if not item:
                 pass
             else:
                 item.url = item.url.strip("/")
                 if item.url not in self.existing_listing_urls:
-                    with JobBased() as db:
-                        item.date_added = datetime.now()
-                        item.prune_strings()
-                        try:
-                            db.add_listing(item)
-                            self.new_listings += 1
-                        except Exception as e:
-                            if "UNIQUE constraint failed" not in str(e):
-                                self.logger.exception(
-                                    "Error adding listing to database."
-                                )
-                            else:
-                                self.already_added_listings += 1
-
-    def mark_dead_listings(self):
-        """Mark listings from the database as dead if they aren't found in the scraped listings."""
-        num_dead = 0
+                    item.date_added = datetime.now()
+                    item.prune_strings()
+                    new_listings.append(item)
+        if new_listings:
+            try:
+                added = self._write("add_listings", new_listings)
+            except Exception:
+                self.write_failed = True
+                self.logger.exception("Error adding listings to database.")
+            else:
+                self.new_listings += added
+                self.already_added_listings += len(new_listings) - added
+
+    def reconcile_listings(self):
+        """Mark listings from the database as dead if they aren't found in the scraped listings
+        and reset the alive status of previously dead listings that were found."""
+        found_urls = {listing.url for listing in self.parsed_items if listing}
         # Don't mark listings dead if scraper had a parse fail
-        if self.parsed_items and not self.had_failures:
+        mark_dead = bool(self.parsed_items) and not self.had_failures
+        if mark_dead:
             self.logger.info("Checking for dead listings.")
-            found_urls = [listing.url for listing in self.parsed_items if listing]
-            live_listings = [
-                listing for listing in self.existing_listings if listing.alive
-            ]
-            dead_listings = [
-                listing for listing in live_listings if listing.url not in found_urls
-            ]
-            num_dead = len(dead_listings)
-            if dead_listings:
-                with JobBased() as db:
-                    for listing in dead_listings:
-                        db.mark_dead(listing.id)
-                        self.logger.info(
-                            f"Marking listing with id {listing.id} as dead. ({listing.position} - {listing.url})"
-                        )
-        self.logger.info(f"Marked {num_dead} listings as dead.")
-
-    def mark_resurrected_listings(self):
-        """Reset the alive status of a listing if the scraper found it and it was previously marked dead."""
-        num_resurrected = 0
-        found_urls = [listing.url for listing in self.parsed_items if listing]
-        dead_listings = [
-            listing for listing in self.existing_listings if not listing.alive
-        ]
-        resurrected_listings = [
-            listing for listing in dead_listings if listing.url in found_urls
-        ]
-        num_resurrected = len(resurrected_listings)
-        if resurrected_listings:
-            with JobBased() as db:
-                for listing in resurrected_listings:
-                    db.resurrect_listing(listing.id)
-                    self.logger.info(
-                        f"Resurrecting listing with id {listing.id}. ({listing.position} - {listing.url})"
-                    )
-        self.logger.info(f"Resurrected {num_resurrected} listings.")
+        try:
+            dead, resurrected = self._write(
+                "reconcile_listings", self.board.company.id, found_urls, mark_dead
+            )
+        except Exception:
+            self.write_failed = True
+            self.logger.exception("Error reconciling dead and resurrected listings.")
+            return
+        listings = {listing.id: listing for listing in self.existing_listings}
+        for listing_id in dead:
+            listing = listings.get(listing_id)
+            details = f" ({listing.position} - {listing.url})" if listing else ""
+            self.logger.info(f"Marking listing with id {listing_id} as dead.{details}")
+        for listing_id in resurrected:
+            listing = listings.get(listing_id)
+            details = f" ({listing.position} - {listing.url})" if listing else ""
+            self.logger.info(f"Resurrecting listing with id {listing_id}.{details}")
+        self.dead_listings += len(dead)
+        self.resurrected_listings += len(resurrected)
+        self.logger.info(f"Marked {len(dead)} listings as dead.")
+        self.logger.info(f"Resurrected {len(resurrected)} listings.")
+
+    def save_board_state(self):
+        """Save the validators and content hash of this scrape's responses if the scrape succeeded.
+
+        After a failure, the board should be parsed in full next time instead of being skipped as unchanged."""
+        if not self.succeeded:
+            return
+        try:
+            if self._new_validators:
+                self._write("save_http_validators", self.board.id, self._new_validators)
+            if self.content_hash and self.parsed_items:
+                self._write("save_content_hash", self.board.id, self.content_hash)
+        except Exception:
+            self.logger.exception("Error saving board state.")
 
     @override
     def postscrape_chores(self):
         super().postscrape_chores()
-        self.mark_dead_listings()
-        self.mark_resurrected_listings()
+        if self.unchanged:
+            return
+        self.reconcile_listings()
+        self.save_board_state()
         self.logger.info(f"Added {self.new_listings} new listings to the database.")
 
 
+@dataclass
+class ParseResult:
+    """What `parse_source` sends back from a worker process."""
+
+    parsed_items: list[models.Listing | None]
+    success_count: int
+    fail_count: int
+    failed_to_get_parsable_items: bool
+
+
+def to_picklable(source: Any) -> Any:
+    """Strip `gruel.Response` objects in `source` down to their status, headers, url, and body.
+
+    Connection and request objects don't need to cross the process boundary to be parsed."""
+    if isinstance(source, list):
+        return [to_picklable(item) for item in source]  # type: ignore
+    if not isinstance(source, gruel.Response):
+        return source
+    response = gruel.Response()
+    response._content = source.content
+    response.status_code = source.status_code
+    response.headers = source.headers
+    response.url = source.url
+    response.encoding = source.encoding
+    response.reason = source.reason
+    return response
+
+
+def hash_source(source: Any) -> str | None:
+    """Returns a hash of the response body, or bodies, in `source`.
+
+    Returns `None` if `source` contains anything other than responses, text, or bytes."""
+    hasher = hashlib.sha256()
+    sources = [source]
+    while sources:
+        item = sources.pop()
+        if isinstance(item, list):
+            # Pages are pushed in reverse so they're hashed in order
+            sources.extend(reversed(item))  # type: ignore
+            continue
+        if isinstance(item, gruel.Response):
+            item = item.content
+        elif isinstance(item, str):
+            item = item.encode()
+        if not isinstance(item, bytes):
+            return None
+        # Length prefix so the same bytes split differently across pages hash differently
+        hasher.update(len(item).to_bytes(8, "big"))
+        hasher.update(item)
+    return hasher.hexdigest()
+
+
+def parse_source(
+    scraper_class: type[JobGruel], board: models.Board, source: Any
+) -> ParseResult:
+    """Run `get_parsable_items` and `parse_item` for `board` on an already fetched `source`.
+
+    Intended to be executed in a worker process by `JobGruel._parse_source`."""
+    scraper = scraper_class({}, board=board)
+    scraper.timer.start()
+    scraper._parse_source(source)
+    scraper.logger.close()
+    return ParseResult(
+        scraper.parsed_items,
+        scraper.success_count,
+        scraper.fail_count,
+        scraper.failed_to_get_parsable_items,
+    )
+
+
+class PaginatedGruel(JobGruel):
+    """`JobGruel` subclass for boards whose listings are split across pages.
+
+    Classes inheriting from `PaginatedGruel` implement `request_page` instead of `get_source`, and either
+
+    @override
+    >>> get_page_count(self, first_page: Response) -> int | None
+
+    if the first page says how many pages there are, or
+
+    @override
+    >>> is_last_page(self, page: Response) -> bool
+
+    if pages have to be requested until one comes back empty.
+
+    Pages after the first are requested in `self.page_executor`, which `JobGlob` shares between every board,
+    with up to `max_concurrent_pages` of a board's pages requested at once.
+    If the page count isn't known, that many pages past the last one received are requested ahead of time.
+    Without a `page_executor`, pages are requested one at a time.
+
+    `get_source` returns the pages in order, so `get_parsable_items` gets a `list[Response]`."""
+
+    # Number of listings per page for APIs that take a page size.
+    # Raise it in a subclass if the board's API allows bigger pages.
+    page_size: int = 20
+    max_concurrent_pages: int = config.jobglob.max_concurrent_pages
+
+    @abc.abstractmethod
+    def request_page(self, page: int) -> gruel.Response:
+        """Request page number `page`, starting from `0`."""
+
+    def get_page_count(self, first_page: gruel.Response) -> int | None:
+        """Returns the total number of pages according to `first_page`.
+
+        Returns `None` if it's unknown, in which case pages are requested until `is_last_page` returns `True`."""
+        return None
+
+    def is_last_page(self, page: gruel.Response) -> bool:
+        """Returns `True` if `page` is past the last page of listings.
+
+        `page` isn't included in the source."""
+        return True
+
+    def _submit_page(self, page: int) -> Future[gruel.Response]:
+        """Request `page` in `self.page_executor` if one is set, otherwise in this thread."""
+        if self.page_executor:
+            return self.page_executor.submit(self.request_page, page)
+        future: Future[gruel.Response] = Future()
+        try:
+            future.set_result(self.request_page(page))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    @override
+    def get_source(self) -> list[gruel.Response]:
+        pages = [self.request_page(0)]
+        page_count = self.get_page_count(pages[0])
+        window = self.max_concurrent_pages if self.page_executor else 1
+        requested: deque[Future[gruel.Response]] = deque()
+        next_page = 1
+        try:
+            while True:
+                while len(requested) < window and (
+                    page_count is None or next_page < page_count
+                ):
+                    requested.append(self._submit_page(next_page))
+                    next_page += 1
+                if not requested:
+                    return pages
+                page = requested.popleft().result()
+                if page_count is None and self.is_last_page(page):
+                    return pages
+                pages.append(page)
+        finally:
+            for future in requested:
+                future.cancel()
+
+
 class GreenhouseGruel(JobGruel):
     """`JobGruel` subclass for Greenhouse job boards."""
 
     @override
     def get_source(self) -> gruel.Response:
-        return self.request(self.board.url)
+        return self.request_if_modified(self.board.url)
 
     @override
     def get_parsable_items(self, source: gruel.Response) -> list[Tag]:
@@ -186,7 +475,7 @@ class LeverGruel(JobGruel):
 
     @override
     def get_source(self) -> gruel.Response:
-        return self.request(self.board.url)
+        return self.request_if_modified(self.board.url)
 
     @override
     def get_parsable_items(self, source: gruel.Response) -> list[Tag]:
@@ -331,7 +620,7 @@ class EasyapplyGruel(JobGruel):
 
     @override
     def get_source(self) -> gruel.Response:
-        return self.request(self.board.url)
+        return self.request_if_modified(self.board.url)
 
     @override
     def get_parsable_items(self, source: gruel.Response) -> list[Tag]:
@@ -365,7 +654,7 @@ class JobviteGruel(JobGruel):
 
     def __init__(
         self,
-        existing_listings: list[models.Listing] | None = None,
+        existing_listings: Mapping[int, Sequence[models.Listing]] | None = None,
         company_stem: str | None = None,
         board: models.Board | None = None,
     ):
@@ -384,7 +673,7 @@ class JobviteGruel(JobGruel):
 
     @override
     def get_source(self) -> gruel.Response:
-        return self.request(self.board.url)
+        return self.request_if_modified(self.board.url)
 
     @override
     def get_parsable_items(self, source: gruel.Response) -> list[Tag]:
@@ -432,7 +721,7 @@ class ApplytojobGruel(JobGruel):
 
     @override
     def get_source(self) -> gruel.Response:
-        return self.request(self.board.url)
+        return self.request_if_modified(self.board.url)
 
     @override
     def get_parsable_items(self, source: gruel.Response) -> list[Tag]:
@@ -458,8 +747,8 @@ class ApplytojobGruel(JobGruel):
         return listing
 
 
-class SmartrecruiterGruel(JobGruel):
-    """`JobGruel` subclass for SmartRecruiters job boards."""
+class SmartrecruiterGruel(PaginatedGruel):
+    """`PaginatedGruel` subclass for SmartRecruiters job boards."""
 
     @property
     def api_endpoint(self) -> str:
@@ -467,21 +756,17 @@ class SmartrecruiterGruel(JobGruel):
         return f"https://careers.smartrecruiters.com/{company_page}/api/more?page="
 
     @override
-    def get_source(self) -> list[gruel.Response]:
-        page_count = 0
-        responses: list[gruel.Response] = []
-        while True:
-            if page_count == 0:
-                responses.append(self.request(self.board.url))
-            else:
-                response = self.request(f"{self.api_endpoint}{page_count}")
-                if not response.text:
-                    break
-                else:
-                    response.raise_for_status()
-                responses.append(response)
-            page_count += 1
-        return responses
+    def request_page(self, page: int) -> gruel.Response:
+        if page == 0:
+            return self.request(self.board.url)
+        response = self.request(f"{self.api_endpoint}{page}")
+        if response.text:
+            response.raise_for_status()
+        return response
+
+    @override
+    def is_last_page(self, page: gruel.Response) -> bool:
+        return not page.text
 
     @override
     def get_parsable_items(self, source: list[gruel.Response]) -> list[Tag]:
@@ -513,7 +798,7 @@ class RecruiteeGruel(JobGruel):
 
     @override
     def get_source(self) -> gruel.Response:
-        return self.request(self.board.url)
+        return self.request_if_modified(self.board.url)
 
     @override
     def get_parsable_items(self, source: gruel.Response) -> list[Tag]:
@@ -547,7 +832,7 @@ class RecruiteeAltGruel(JobGruel):
 
     @override
     def get_source(self) -> gruel.Response:
-        return self.request(self.board.url)
+        return self.request_if_modified(self.board.url)
 
     @override
     def get_parsable_items(self, source: gruel.Response) -> list[Tag]:
@@ -573,7 +858,7 @@ class BreezyGruel(JobGruel):
 
     @override
     def get_source(self) -> gruel.Response:
-        return self.request(self.board.url)
+        return self.request_if_modified(self.board.url)
 
     @override
     def get_parsable_items(self, source: gruel.Response) -> list[Tag]:
@@ -596,8 +881,11 @@ class BreezyGruel(JobGruel):
         return listing
 
 
-class MyworkdayGruel(JobGruel):
-    """`JobGruel` subclass for MyWorkDay job boards."""
+class MyworkdayGruel(PaginatedGruel):
+    """`PaginatedGruel` subclass for MyWorkDay job boards."""
+
+    # The API rejects requests for more than 20 postings at a time
+    page_size = 20
 
     @property
     def api_url(self) -> str:
@@ -615,32 +903,24 @@ class MyworkdayGruel(JobGruel):
         return f"{base}/wday/cxs/{company_stem}/{anchor}/jobs"
 
     @override
-    def get_source(self) -> list[gruel.Response]:
-        response_count = 0
-        listings_per_response = 20
-        headers = {
-            "Content-Type": "application/json",
-            "Accept-Encoding": "gzip, deflate",
-        }
-        next_response: Callable[[int], gruel.Response] = (
-            lambda response_count: self.request(
-                self.api_url,
-                "post",
-                headers=headers,
-                json={
-                    "limit": str(listings_per_response),
-                    "offset": str(response_count * listings_per_response),
-                },
-            )
+    def request_page(self, page: int) -> gruel.Response:
+        return self.request(
+            self.api_url,
+            "post",
+            headers={
+                "Content-Type": "application/json",
+                "Accept-Encoding": "gzip, deflate",
+            },
+            json={
+                "limit": str(self.page_size),
+                "offset": str(page * self.page_size),
+            },
         )
-        responses: list[gruel.Response] = []
-        response = next_response(response_count)
-        total_listings = response.json()["total"]
-        total_responses = int(total_listings / listings_per_response) + 1
-        responses.append(response)
-        for response_count in range(1, total_responses):
-            responses.append(next_response(response_count))
-        return responses
+
+    @override
+    def get_page_count(self, first_page: gruel.Response) -> int | None:
+        # Only the first page has the actual total
+        return max(math.ceil(first_page.json()["total"] / self.page_size), 1)
 
     @override
     def get_parsable_items(self, source: list[gruel.Response]) -> list[dict[str, Any]]:
@@ -669,7 +949,7 @@ class TeamtailorGruel(JobGruel):
 
     @override
     def get_source(self) -> gruel.Response:
-        return self.request(self.board.url)
+        return self.request_if_modified(self.board.url)
 
     @override
     def get_parsable_items(self, source: gruel.Response) -> list[Tag]:
@@ -702,7 +982,7 @@ class PaycomGruel(JobGruel):
 
     @override
     def get_source(self) -> gruel.Response:
-        return self.request(self.board.url)
+        return self.request_if_modified(self.board.url)
 
     @override
     def get_parsable_items(self, source: gruel.Response) -> list[dict[str, Any]]:
@@ -728,7 +1008,7 @@ class PaylocityGruel(JobGruel):
 
     @override
     def get_source(self) -> gruel.Response:
-        return self.request(self.board.url)
+        return self.request_if_modified(self.board.url)
 
     @override
     def get_parsable_items(self, source: gruel.Response) -> list[dict[str, Any]]:
@@ -767,7 +1047,7 @@ class DoverGruel(JobGruel):
 
     @override
     def get_source(self) -> gruel.Response:
-        return self.request(self.api_endpoint)
+        return self.request_if_modified(self.api_endpoint)
 
     @override
     def get_parsable_items(self, source: gruel.Response) -> list[dict[str, Any]]:
@@ -794,7 +1074,7 @@ class RipplingGruel(JobGruel):
 
     @override
     def get_source(self) -> gruel.Response:
-        return self.request(self.board.url)
+        return self.request_if_modified(self.board.url)
 
     @override
     def get_parsable_items(self, source: gruel.Response) -> list[Tag]:
@@ -1,6 +1,8 @@
 import os
+import sqlite3
 import webbrowser
 from datetime import datetime, timedelta
+from typing import Any, Callable
 
 import argshell
 from databased.dbshell import DBShell
@@ -13,6 +15,7 @@ import board_detector
 import company_crawler
 import dump_data
 import helpers
+import jobbased
 import jobglob
 import logglob
 import models
@@ -20,6 +23,7 @@ import peruse
 import shellparsers
 from config import Config
 from jobbased import JobBased
+from peruse_filters import PeruseFilters
 
 root = Pathier(__file__).parent
 
@@ -47,6 +51,8 @@ class JobShell(DBShell):
         "toggle_scraper",
         "select",
         "apps",
+        "search",
+        "search_hits",
     ]
     common_commands = sorted(set(common_commands))
     intro = "Starting job_manager (enter help or ? for command info)..."
@@ -71,7 +77,7 @@ class JobShell(DBShell):
                 )
             )
             if args.applied:
-                listing = db._get_listings(f"url = '{args.url}'")[0]
+                listing = db._get_listings("url = ?", parameters=(args.url,))[0]
                 db.add_application(listing.id)
 
     @argshell.with_parser(shellparsers.get_add_board_parser)
@@ -95,12 +101,67 @@ class JobShell(DBShell):
         with JobBased(self.dbpath) as db:
             self.display(db.select("apps"))
 
+    def _bulk_triage(
+        self,
+        args: argshell.Namespace,
+        triage: Callable[[JobBased, str, list[Any]], int],
+    ):
+        """Apply `triage` to the listings matching `args.where` and/or the `peruse_filters.toml` filters."""
+        clauses: list[str] = []
+        parameters: list[Any] = []
+        if args.where:
+            clauses.append(f"({' '.join(args.where)})")
+        if args.filtered:
+            where, filter_parameters = PeruseFilters.load().to_where()
+            clauses.append(f"({where})")
+            parameters.extend(filter_parameters)
+        if not clauses:
+            print("A `where` clause and/or `-f` is required.")
+            return
+        where = " AND ".join(clauses)
+        with JobBased(self.dbpath) as db:
+            try:
+                num_matching = db.count(
+                    "listings",
+                    where=f"listing_id IN ({jobbased.select_listing_ids(where)})",
+                    parameters=parameters,
+                )
+            except sqlite3.OperationalError as e:
+                print(f"Invalid `where` clause: {e}")
+                return
+            if not args.yes and input(
+                f"{num_matching} listings match. Continue? (y/n) "
+            ).lower() not in ["y", "yes"]:
+                return
+            print(f"Updated {triage(db, where, parameters)} listings.")
+
+    @argshell.with_parser(shellparsers.get_bulk_triage_parser)
+    def do_bulk_mark_dead(self, args: argshell.Namespace):
+        """Mark every live listing matching a `where` clause and/or the `peruse_filters.toml` filters as dead."""
+        self._bulk_triage(args, JobBased.mark_dead_where)
+
+    @argshell.with_parser(shellparsers.get_bulk_triage_parser)
+    def do_bulk_mark_seen(self, args: argshell.Namespace):
+        """Mark every listing matching a `where` clause and/or the `peruse_filters.toml` filters as seen."""
+        self._bulk_triage(args, JobBased.mark_seen_where)
+
+    @argshell.with_parser(shellparsers.get_bulk_triage_parser)
+    def do_bulk_pin(self, args: argshell.Namespace):
+        """Pin every listing matching a `where` clause and/or the `peruse_filters.toml` filters."""
+        self._bulk_triage(args, JobBased.pin_where)
+
+    @argshell.with_parser(shellparsers.get_bulk_triage_parser)
+    def do_bulk_resurrect(self, args: argshell.Namespace):
+        """Resurrect every dead listing matching a `where` clause and/or the `peruse_filters.toml` filters."""
+        self._bulk_triage(args, JobBased.resurrect_where)
+
     def do_company_exists(self, company: str):
         """Return info about `company` if it exists in the database."""
         with JobBased(self.dbpath) as db:
-            where = f"company LIKE '%{company}%'"
-            if db.count("scrapers", where=where):
-                data = db.select("scrapers", where=where)
+            where = "company LIKE ?"
+            parameters = (f"%{company}%",)
+            if db.count("scrapers", where=where, parameters=parameters):
+                data = db.select("scrapers", where=where, parameters=parameters)
                 self.display(data)
             else:
                 print(f"Could not find records matching '%{company}%'.")
@@ -129,6 +190,12 @@ class JobShell(DBShell):
             else:
                 helpers.create_scraper_from_template(board.url, board.company.name)
 
+    def do_delete_search(self, name: str):
+        """Delete a saved search and its hits."""
+        with JobBased(self.dbpath) as db:
+            if not db.delete_saved_search(name):
+                print(f"There's no saved search named `{name}`.")
+
     def do_dump(self, _: str):
         """Dump data for `companies`, `boards`, and `listings` tables to `sql/jobs_data.sql`."""
         print("Creating dump file...")
@@ -235,6 +302,91 @@ class JobShell(DBShell):
             for id_ in listing_ids.split():
                 db.reset_alive_status(int(id_))
 
+    def _display_listings(self, listings: list[models.Listing]):
+        self.display(
+            [
+                {
+                    "l_id": listing.id,
+                    "position": listing.position,
+                    "company": listing.company.name,
+                    "location": listing.location,
+                    "alive": int(listing.alive),
+                    "url": listing.url,
+                }
+                for listing in listings
+            ]
+        )
+        print(f"{len(listings)} results.")
+
+    def _get_search_query(self, args: argshell.Namespace) -> str | None:
+        """Returns the FTS5 query for a `search` or `save_search` command.
+
+        Returns `None` if any of the terms are too short to search for."""
+        short_terms = [
+            term
+            for term in args.terms
+            if len(term) < jobbased.min_search_term_length
+        ]
+        if short_terms and not args.raw:
+            print(
+                f"Terms shorter than {jobbased.min_search_term_length} characters can't be searched: {short_terms}"
+            )
+            return None
+        return (
+            " ".join(args.terms)
+            if args.raw
+            else jobbased.to_search_query(
+                args.terms, "position" if args.positions else None
+            )
+        )
+
+    @argshell.with_parser(shellparsers.get_save_search_parser)
+    def do_save_search(self, args: argshell.Namespace):
+        """Save a search. After each glob, newly added listings matching it are recorded and can be viewed with `search_hits`."""
+        query = self._get_search_query(args)
+        if not query:
+            return
+        with JobBased(self.dbpath) as db:
+            try:
+                db.add_saved_search(args.name, query)
+            except sqlite3.OperationalError as e:
+                print(f"Invalid search query `{query}`: {e}")
+                return
+            except sqlite3.IntegrityError:
+                print(f"There's already a saved search named `{args.name}`.")
+                return
+            # Test the new search against the listings that are already in the database
+            num_hits = db.run_saved_searches()[args.name]
+        print(f"Saved search `{args.name}` matches {num_hits} listings.")
+
+    @argshell.with_parser(shellparsers.get_search_parser)
+    def do_search(self, args: argshell.Namespace):
+        """Search listings by position and location."""
+        query = self._get_search_query(args)
+        if not query:
+            return
+        with JobBased(self.dbpath) as db:
+            try:
+                listings = db.search_listings(
+                    query, live_only=not args.dead, unseen_only=not args.seen
+                )
+            except sqlite3.OperationalError as e:
+                print(f"Invalid search query `{query}`: {e}")
+                return
+        self._display_listings(listings)
+
+    @argshell.with_parser(shellparsers.get_search_hits_parser)
+    def do_search_hits(self, args: argshell.Namespace):
+        """Show the listings found by a saved search, or the number of hits for each saved search if no name is given."""
+        with JobBased(self.dbpath) as db:
+            if not args.name:
+                self.display(db.get_search_hit_counts())
+                return
+            listings = db.get_search_hits(
+                args.name, live_only=not args.dead, unseen_only=not args.seen
+            )
+        self._display_listings(listings)
+
     @argshell.with_parser(shellparsers.get_toggle_scraper_parser)
     def do_toggle_scraper(self, args: argshell.Namespace):
         """Activate or deactivate scrapers/boards."""
@@ -242,13 +394,13 @@ class JobShell(DBShell):
         with JobBased() as db:
             for scraper in args.scrapers:
                 try:
-                    where = f"board_id = {int(scraper)}"
+                    where, parameters = "board_id = ?", (int(scraper),)
                 except Exception as e:
                     company = db.get_company_from_name(helpers.stem_to_name(scraper))
                     assert company
-                    where = f"company_id = {company.id}"
+                    where, parameters = "company_id = ?", (company.id,)
                 print(
-                    f"{scraper} updated: {db.update('boards', 'active', active, where)}"
+                    f"{scraper} updated: {db.update('boards', 'active', active, where, parameters)}"
                 )
 
     def do_trouble_shoot(self, file_stem: str):
@@ -257,7 +409,9 @@ class JobShell(DBShell):
         self.do_open(file_stem)
         company = file_stem.replace("_", " ")
         with JobBased(self.dbpath) as db:
-            self.display(db.select("scrapers", where=f"company LIKE '{company}'"))
+            self.display(
+                db.select("scrapers", where="company LIKE ?", parameters=(company,))
+            )
         scraper_file = config.scrapers_dir / f"{file_stem}.py"
         if scraper_file.exists():
             os.system(f"code {scraper_file} -r")
@@ -0,0 +1,181 @@
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Iterable, Sequence
+
+import loggi
+from pathier import Pathier
+from typing_extensions import Self
+
+import models
+from config import Config
+from jobbased import JobBased
+
+root = Pathier(__file__).parent
+config = Config.load()
+""" Single writer for scraped listing changes.
+
+When many scrapers run at once, each one opening its own connection and committing every change
+leads to lock contention on the database file.
+Instead, scrapers submit their changes to a `ListingWriter`, which applies them from one thread
+and one connection, committing pending changes together in batches.
+"""
+
+# A pending write: the name of the `JobBased` method to call, its arguments, and the future for its result
+Write = tuple[str, tuple[Any, ...], Future[Any]]
+
+
+class ListingWriter(loggi.LoggerMixin):
+    """Apply listing inserts, deaths, and resurrections from a single background thread.
+
+    Every submission returns a `Future` that resolves to the number of affected rows once the batch it's in is committed.
+
+    >>> with ListingWriter() as writer:
+    >>>     added = writer.add_listings(listings).result()
+    """
+
+    def __init__(self, batch_size: int = config.jobglob.write_batch_size):
+        """
+        :params:
+        * `batch_size`: The maximum number of submissions to commit in one transaction.
+        """
+        self.init_logger("listingwriter", config.logs_dir)
+        self.batch_size = batch_size
+        self._queue: queue.Queue[Write | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any, **kwargs: Any):
+        self.close()
+
+    @property
+    def running(self) -> bool:
+        """Whether the writer thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _submit(self, method: str, *args: Any) -> Future[Any]:
+        future: Future[Any] = Future()
+        if not self.running:
+            future.set_exception(RuntimeError("`ListingWriter` is not running."))
+        else:
+            self._queue.put((method, args, future))
+        return future
+
+    def add_listings(self, listings: Sequence[models.Listing]) -> Future[int]:
+        """Queue `listings` to be added to the database.
+
+        The future resolves to the number of listings that weren't already in the database."""
+        return self._submit("add_listings", listings)
+
+    def reconcile_listings(
+        self, company_id: int, found_urls: Iterable[str], mark_dead: bool = True
+    ) -> Future[tuple[list[int], list[int]]]:
+        """Queue a `JobBased.reconcile_listings` call.
+
+        The future resolves to the ids of the listings marked dead and the ids of the listings resurrected."""
+        return self._submit("reconcile_listings", company_id, found_urls, mark_dead)
+
+    def save_content_hash(self, board_id: int, content_hash: str) -> Future[int]:
+        """Queue a `JobBased.save_content_hash` call."""
+        return self._submit("save_content_hash", board_id, content_hash)
+
+    def save_http_validators(
+        self, board_id: int, validators: dict[str, tuple[str | None, str | None]]
+    ) -> Future[int]:
+        """Queue a `JobBased.save_http_validators` call."""
+        return self._submit("save_http_validators", board_id, validators)
+
+    def start(self):
+        """Start the writer thread."""
+        if self.running:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="listingwriter", daemon=True
+        )
+        self._thread.start()
+
+    def flush(self):
+        """Block until every submission so far has been committed."""
+        self._queue.join()
+
+    def close(self):
+        """Commit any pending submissions and stop the writer thread."""
+        if not self.running:
+            return
+        assert self._thread
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _next_batch(self) -> tuple[list[Write], bool]:
+        """Block until there's at least one submission, then take as many more as are waiting, up to `self.batch_size`.
+
+        The second element of the returned tuple is `True` if the writer was asked to stop."""
+        batch: list[Write] = []
+        write = self._queue.get()
+        while write is not None:
+            batch.append(write)
+            if len(batch) >= self.batch_size:
+                return batch, False
+            try:
+                write = self._queue.get_nowait()
+            except queue.Empty:
+                return batch, False
+        self._queue.task_done()
+        return batch, True
+
+    def _commit_batch(self, db: JobBased, batch: list[Write]):
+        """Apply each write in `batch` inside its own savepoint and commit them together.
+
+        A write that raises is rolled back to its savepoint, so only its future gets the exception
+        and the rest of the batch is still committed."""
+        results: list[tuple[Future[Any], Any, Exception | None]] = []
+        try:
+            if not db.connected:
+                db.connect()
+            assert db.connection
+            if not db.connection.in_transaction:
+                # Otherwise releasing the first savepoint would commit it on its own
+                db.query("BEGIN;")
+            for method, args, future in batch:
+                db.query("SAVEPOINT write;")
+                try:
+                    write: Callable[..., Any] = getattr(db, method)
+                    result = write(*args)
+                except Exception as e:
+                    self.logger.exception(f"Failed to apply `{method}`.")
+                    db.query("ROLLBACK TO write;")
+                    results.append((future, None, e))
+                else:
+                    results.append((future, result, None))
+                db.query("RELEASE write;")
+            db.commit()
+        except Exception as e:
+            self.logger.exception(f"Failed to commit a batch of {len(batch)} writes.")
+            if db.connection:
+                db.connection.rollback()
+            for *_, future in batch:
+                future.set_exception(e)
+        else:
+            failed = sum(1 for *_, error in results if error)
+            self.logger.info(
+                f"Committed a batch of {len(batch) - failed} writes, {failed} failed."
+            )
+            for future, result, error in results:
+                if error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+        for _ in batch:
+            self._queue.task_done()
+
+    def _run(self):
+        with JobBased(commit_on_close=False) as db:
+            stop = False
+            while not stop:
+                batch, stop = self._next_batch()
+                if batch:
+                    self._commit_batch(db, batch)
@@ -0,0 +1,204 @@
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+
+import numpy as np
+import numpy.typing as npt
+from typing_extensions import Self
+
+from jobbased import JobBased
+
+""" Columnar, read only view of the `listings` table for analytics.
+
+Instead of one `models.Listing` per row, a `ListingFrame` holds each column in a NumPy array,
+so filtering and aggregating hundreds of thousands of listings is a handful of vectorized operations.
+
+>>> frame = ListingFrame.load()
+>>> recent = frame[frame.alive & frame.added_since(datetime(2024, 1, 1))]
+>>> recent.listings_per_company()
+"""
+
+
+# SQL expression converting a timestamp column to milliseconds since the Unix epoch,
+# so it can be loaded straight into a `datetime64[ms]` array. `NULL` becomes `NaT`.
+# (`julianday` is a float, so finer units than milliseconds aren't accurate.)
+_epoch_ms = "IFNULL(CAST(ROUND((julianday({0}) - 2440587.5) * 86400000) AS INTEGER), -9223372036854775808)"
+
+
+# Code of a `NULL` position or location, which isn't one of the categories
+missing_code = -1
+
+
+def _categorize(
+    values: tuple[str | None, ...]
+) -> tuple[npt.NDArray[np.str_], npt.NDArray[np.int32]]:
+    """Returns the unique values in `values`, in order of first appearance, and the index of each value into them.
+
+    `None` gets `missing_code` instead of a category."""
+    indices: dict[str, int] = {}
+    codes = [
+        missing_code if value is None else indices.setdefault(value, len(indices))
+        for value in values
+    ]
+    return np.array(list(indices), dtype=np.str_), np.array(codes, dtype=np.int32)
+
+
+@dataclass(frozen=True)
+class ListingFrame:
+    """Listings stored as parallel arrays, one element per listing.
+
+    Positions and locations are categorical:
+    `positions[position_codes[i]]` is the position of the `i`th listing.
+    A listing without a position or location has `missing_code` for it and is left out of any grouping by category.
+
+    Index with a boolean mask (or any other NumPy index) to get a new frame with just those listings.
+    Categories and company names are shared between a frame and the frames derived from it.
+    """
+
+    ids: npt.NDArray[np.int64]
+    company_ids: npt.NDArray[np.int64]
+    alive: npt.NDArray[np.bool_]
+    date_added: npt.NDArray[np.datetime64]
+    date_removed: npt.NDArray[np.datetime64]
+    position_codes: npt.NDArray[np.int32]
+    location_codes: npt.NDArray[np.int32]
+    positions: npt.NDArray[np.str_]
+    locations: npt.NDArray[np.str_]
+    company_names: dict[int, str] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, db: JobBased | None = None, where: str = "1 = 1") -> Self:
+        """Load every listing satisfying the `where` clause.
+
+        If `db` isn't given, a new `JobBased` connection is opened and closed."""
+        if not db:
+            with JobBased() as db:
+                return cls.load(db, where)
+        if not db.connected:
+            db.connect()
+        assert db.connection
+        cursor = db.connection.cursor()
+        # Plain tuples and integer dates are much cheaper to load than dicts and `datetime` objects
+        cursor.row_factory = None
+        rows = cursor.execute(
+            f"""
+            SELECT listing_id, company_id, alive, position, location,
+                {_epoch_ms.format("date_added")}, {_epoch_ms.format("date_removed")}
+            FROM listings WHERE {where} ORDER BY listing_id;"""
+        ).fetchall()
+        company_names = dict(
+            cursor.execute("SELECT company_id, name FROM companies;").fetchall()
+        )
+        cursor.close()
+        if not rows:
+            empty = np.array([], dtype=np.str_)
+            return cls(
+                np.array([], dtype=np.int64),
+                np.array([], dtype=np.int64),
+                np.array([], dtype=np.bool_),
+                np.array([], dtype="datetime64[ms]"),
+                np.array([], dtype="datetime64[ms]"),
+                np.array([], dtype=np.int32),
+                np.array([], dtype=np.int32),
+                empty,
+                empty,
+                company_names,
+            )
+        ids, company_ids, alive, positions, locations, added, removed = zip(*rows)
+        positions, position_codes = _categorize(positions)
+        locations, location_codes = _categorize(locations)
+        return cls(
+            np.array(ids, dtype=np.int64),
+            np.array(company_ids, dtype=np.int64),
+            np.array(alive, dtype=np.bool_),
+            np.array(added, dtype=np.int64).view("datetime64[ms]"),
+            np.array(removed, dtype=np.int64).view("datetime64[ms]"),
+            position_codes,
+            location_codes,
+            positions,
+            locations,
+            company_names,
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: npt.ArrayLike) -> Self:
+        return replace(
+            self,
+            ids=self.ids[index],
+            company_ids=self.company_ids[index],
+            alive=self.alive[index],
+            date_added=self.date_added[index],
+            date_removed=self.date_removed[index],
+            position_codes=self.position_codes[index],
+            location_codes=self.location_codes[index],
+        )
+
+    def _category_mask(
+        self,
+        categories: npt.NDArray[np.str_],
+        codes: npt.NDArray[np.int32],
+        terms: list[str],
+    ) -> npt.NDArray[np.bool_]:
+        """Returns a mask of the listings whose category contains any of `terms` (case insensitive).
+
+        The substring search only runs once per category rather than once per listing."""
+        lowered = np.char.lower(categories)
+        matches = np.zeros(len(categories), dtype=np.bool_)
+        for term in terms:
+            matches |= np.char.find(lowered, term.lower()) != -1
+        # `missing_code` indexes the appended `False`, so missing values never match
+        return np.append(matches, False)[codes]
+
+    def position_contains(self, *terms: str) -> npt.NDArray[np.bool_]:
+        """Mask of listings whose position contains any of `terms` (case insensitive)."""
+        return self._category_mask(self.positions, self.position_codes, list(terms))
+
+    def location_contains(self, *terms: str) -> npt.NDArray[np.bool_]:
+        """Mask of listings whose location contains any of `terms` (case insensitive)."""
+        return self._category_mask(self.locations, self.location_codes, list(terms))
+
+    def from_companies(self, *company_ids: int) -> npt.NDArray[np.bool_]:
+        """Mask of listings belonging to any of `company_ids`."""
+        return np.isin(self.company_ids, company_ids)
+
+    def added_since(self, start: datetime) -> npt.NDArray[np.bool_]:
+        """Mask of listings added on or after `start`."""
+        return self.date_added >= np.datetime64(start, "ms")
+
+    def removed_since(self, start: datetime) -> npt.NDArray[np.bool_]:
+        """Mask of listings removed on or after `start`."""
+        return self.date_removed >= np.datetime64(start, "ms")
+
+    def listings_per_company(self) -> dict[str, int]:
+        """Returns the number of listings for each company, most listings first."""
+        company_ids, counts = np.unique(self.company_ids, return_counts=True)
+        order = np.argsort(counts, kind="stable")[::-1]
+        return {
+            self.company_names.get(int(company_id), str(company_id)): int(count)
+            for company_id, count in zip(company_ids[order], counts[order])
+        }
+
+    def time_to_removal(self) -> npt.NDArray[np.float64]:
+        """Returns the number of days each removed listing was up for."""
+        removed = ~np.isnat(self.date_removed)
+        lifetimes = self.date_removed[removed] - self.date_added[removed]
+        return lifetimes / np.timedelta64(1, "D")
+
+    def time_to_removal_by_company(
+        self, percentiles: list[float] = [25, 50, 75]
+    ) -> dict[str, list[float]]:
+        """Returns the given percentiles of `time_to_removal()`, in days, for each company with removed listings."""
+        removed = ~np.isnat(self.date_removed)
+        company_ids = self.company_ids[removed]
+        lifetimes = self.time_to_removal()
+        # Sort by company so each company's lifetimes are one contiguous slice
+        order = np.argsort(company_ids, kind="stable")
+        company_ids, lifetimes = company_ids[order], lifetimes[order]
+        unique_ids, starts = np.unique(company_ids, return_index=True)
+        return {
+            self.company_names.get(int(company_id), str(company_id)): [
+                float(value) for value in np.percentile(group, percentiles)
+            ]
+            for company_id, group in zip(unique_ids, np.split(lifetimes, starts[1:]))
+        }
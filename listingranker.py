@@ -0,0 +1,141 @@
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+
+import numpy as np
+import numpy.typing as npt
+from typing_extensions import Self
+
+import models
+from helpers import tokenize
+from jobbased import JobBased
+
+""" Rank listings by how relevant their positions are to a set of weighted query terms, using BM25.
+
+Document statistics (how many positions contain each term, and how long positions are on average)
+are kept in the `position_terms` tables, which `JobBased.add_listings` updates as listings are added.
+
+>>> with JobBased() as db:
+>>>     ranker = ListingRanker.load(db, ["python", "data"])
+>>>     listings = ranker.rank(db.get_unseen_live_listings())
+"""
+
+
+@dataclass
+class ListingRanker:
+    """Score listing positions against `query`, a mapping of terms to weights, with BM25.
+
+    `document_frequencies` is the number of positions containing each query term,
+    out of `num_documents` positions with an average of `average_length` terms.
+    """
+
+    query: dict[str, float]
+    document_frequencies: dict[str, int]
+    num_documents: int
+    average_length: float
+    k1: float = 1.2
+    b: float = 0.75
+
+    @classmethod
+    def load(cls, db: JobBased, default_search: Iterable[str] = ()) -> Self:
+        """Returns a ranker whose query is made from `default_search` and the positions of pinned and applied listings.
+
+        Each default search term has a weight of 1.
+        Each term from pinned and applied positions is weighted by the fraction of those positions it's in.
+
+        The statistics come from `position_terms`, see `JobBased.update_term_stats`."""
+        query: dict[str, float] = {}
+        for phrase in default_search:
+            for term in tokenize(phrase):
+                query[term] = 1.0
+        history = [
+            row["position"]
+            for row in db.query(
+                "SELECT position FROM listings WHERE listing_id IN (SELECT listing_id FROM pinned_listings UNION SELECT listing_id FROM applications);"
+            )
+        ]
+        for term, count in Counter(
+            term for position in history for term in set(tokenize(position or ""))
+        ).items():
+            query[term] = query.get(term, 0.0) + count / len(history)
+        state = db.query(
+            "SELECT document_count, total_length FROM position_terms_state;"
+        )[0]
+        document_frequencies: dict[str, int] = {}
+        if query:
+            document_frequencies = {
+                row["term"]: row["document_count"]
+                for row in db.query(
+                    f"SELECT term, document_count FROM position_terms WHERE term IN ({', '.join('?' * len(query))});",
+                    list(query),
+                )
+            }
+        return cls(
+            query,
+            document_frequencies,
+            state["document_count"],
+            state["total_length"] / max(state["document_count"], 1),
+        )
+
+    def scores(self, positions: Sequence[str]) -> npt.NDArray[np.float64]:
+        """Returns the BM25 score of each of `positions`.
+
+        Only occurrences of query terms are collected, as `(position, term)` index pairs,
+        so the scoring is a handful of array operations no matter how many distinct terms there are."""
+        terms = list(self.query)
+        if not terms or not positions:
+            return np.zeros(len(positions))
+        index = {term: i for i, term in enumerate(terms)}
+        lengths = np.empty(len(positions))
+        position_ids: list[int] = []
+        term_ids: list[int] = []
+        for i, position in enumerate(positions):
+            tokens = tokenize(position or "")
+            lengths[i] = len(tokens)
+            for token in tokens:
+                term_id = index.get(token)
+                if term_id is not None:
+                    position_ids.append(i)
+                    term_ids.append(term_id)
+        if not position_ids:
+            return np.zeros(len(positions))
+        # Count each query term's occurrences in each position
+        pairs, frequencies = np.unique(
+            np.array(position_ids, dtype=np.int64) * len(terms)
+            + np.array(term_ids, dtype=np.int64),
+            return_counts=True,
+        )
+        position_ids_, term_ids_ = np.divmod(pairs, len(terms))
+        document_frequencies = np.array(
+            [self.document_frequencies.get(term, 0) for term in terms],
+            dtype=np.float64,
+        )
+        # Terms the statistics haven't seen yet are treated as if they're in one position
+        num_documents = max(self.num_documents, 1)
+        document_frequencies = np.clip(document_frequencies, 1, num_documents)
+        idf = np.log(
+            (num_documents - document_frequencies + 0.5)
+            / (document_frequencies + 0.5)
+            + 1
+        )
+        weights = idf * np.array([self.query[term] for term in terms])
+        length_norms = self.k1 * (
+            1
+            - self.b
+            + self.b * lengths[position_ids_] / max(self.average_length, 1.0)
+        )
+        contributions = (
+            weights[term_ids_]
+            * frequencies
+            * (self.k1 + 1)
+            / (frequencies + length_norms)
+        )
+        return np.bincount(position_ids_, contributions, len(positions))
+
+    def rank(self, listings: Sequence[models.Listing]) -> list[models.Listing]:
+        """Returns `listings` ordered from highest to lowest score.
+
+        Listings with the same score keep their order."""
+        scores = self.scores([listing.position for listing in listings])
+        order = np.argsort(-scores, kind="stable")
+        return [listings[i] for i in order]
@@ -7,7 +7,7 @@ from pathier import Pathier
 root = Pathier(__file__).parent
 
 
-@dataclass
+@dataclass(slots=True)
 class Company:
     """
     Fields:
@@ -21,7 +21,7 @@ class Company:
     date_added: datetime = datetime.now()
 
 
-@dataclass
+@dataclass(slots=True)
 class Board:
     """
     Fields:
@@ -39,7 +39,7 @@ class Board:
     date_added: datetime = datetime.now()
 
 
-@dataclass
+@dataclass(slots=True)
 class Listing:
     """
     Fields:
@@ -72,7 +72,7 @@ class Listing:
         self.location = prune(self.location)
 
 
-@dataclass
+@dataclass(slots=True)
 class Application:
     """
     Fields:
@@ -86,7 +86,7 @@ class Application:
     date_applied: datetime = datetime.now()
 
 
-@dataclass
+@dataclass(slots=True)
 class Rejection:
     """
     Fields:
@@ -100,7 +100,25 @@ class Rejection:
     date_rejected: datetime = datetime.now()
 
 
-@dataclass
+@dataclass(slots=True)
+class SavedSearch:
+    """
+    Fields:
+    * id: int
+    * name: str
+    * query: str
+    * last_listing_id: int
+    * date_added: datetime
+    """
+
+    id: int = -1
+    name: str = ""
+    query: str = ""
+    last_listing_id: int = 0
+    date_added: datetime = datetime.now()
+
+
+@dataclass(slots=True)
 class Scraper:
     """
     Fields:
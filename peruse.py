@@ -1,16 +1,24 @@
 import argparse
+import heapq
+import itertools
+import re
+import threading
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict
+from typing import Iterable, Iterator
 
 import argshell
 from pathier import Pathier
 from printbuddies import Grid
 from rich import print
 
+import jobbased
 import models
 from config import Config
 from jobbased import JobBased
-from peruse_filters import PeruseFilters
+from listingranker import ListingRanker
+from peruse_filters import PeruseFilters, compile_terms, like_any
 
 root = Pathier(__file__).parent
 config = Config.load()
@@ -77,6 +85,14 @@ def get_peruse_parser() -> argshell.ArgShellParser:
         help=""" Show newest listings first.""",
     )
 
+    parser.add_argument(
+        "-r",
+        "--ranked",
+        action="store_true",
+        help=""" Show the listings most relevant to `default_search` and the positions of your pinned and applied listings first.
+        Overrides `--newest_first` except between equally relevant listings.""",
+    )
+
     parser.add_argument(
         "-a",
         "--all",
@@ -113,24 +129,104 @@ def get_args() -> argshell.Namespace:
 
 
 def filter_listings(
-    listings: list[models.Listing],
-    filter_on: str,
-    key_terms: list[str],
-    exclude_terms: list[str],
-) -> list[models.Listing]:
-    """Filter `listings` on the field specified by `filter_on`."""
-    filtered_listings: list[models.Listing] = []
+    listings: Iterable[models.Listing],
+    excludes: dict[str, re.Pattern[str] | None],
+    key_terms: re.Pattern[str] | None = None,
+) -> Iterator[models.Listing]:
+    """Lazily filter `listings` in one pass.
+
+    A listing is skipped if any of the fields in `excludes` match that field's pattern (e.g. `{"location": pattern}`),
+    or if `key_terms` is given and doesn't match the listing's position.
+    Patterns are matched against lowercased text, see `peruse_filters.compile_terms`."""
+    excludes_ = [(field, pattern) for field, pattern in excludes.items() if pattern]
     for listing in listings:
-        column = getattr(listing, filter_on).lower()
-        if any(exclude in column for exclude in exclude_terms):
+        if any(
+            pattern.search(getattr(listing, field).lower())
+            for field, pattern in excludes_
+        ):
             continue
-        if key_terms and all(key not in column for key in key_terms):
+        if key_terms and not key_terms.search(listing.position.lower()):
             continue
-        filtered_listings.append(listing)
-    return filtered_listings
-
-
-def do_action(listing: models.Listing) -> bool | None:
+        yield listing
+
+
+class ActionBuffer:
+    """Save up actions taken on listings and write them to the database together.
+
+    Actions are written in one transaction every `flush_every` actions and whenever `flush` is called."""
+
+    def __init__(self, flush_every: int = config.peruse.flush_every):
+        self.flush_every = flush_every
+        self.num_actions = 0
+        self.pinned: list[int] = []
+        self.seen: list[int] = []
+        self.dead: list[int] = []
+
+    def _added(self):
+        self.num_actions += 1
+        if self.num_actions >= self.flush_every:
+            self.flush()
+
+    def pin(self, listing_id: int):
+        """Pin the listing and mark it seen."""
+        self.pinned.append(listing_id)
+        self.seen.append(listing_id)
+        self._added()
+
+    def mark_seen(self, listing_id: int):
+        """Mark the listing seen."""
+        self.seen.append(listing_id)
+        self._added()
+
+    def mark_dead(self, listing_id: int):
+        """Mark the listing dead."""
+        self.dead.append(listing_id)
+        self._added()
+
+    def flush(self):
+        """Write all saved up actions to the database."""
+        if not self.num_actions:
+            return
+        with JobBased() as db:
+            db.pin_listings(self.pinned)
+            db.mark_listings_seen(self.seen)
+            db.mark_listings_dead(self.dead)
+        self.num_actions = 0
+        self.pinned.clear()
+        self.seen.clear()
+        self.dead.clear()
+
+
+class ListingPager:
+    """Iterate over `listings` a page at a time, loading the next page in a background thread while the current one is being shown."""
+
+    def __init__(
+        self,
+        listings: Iterator[models.Listing],
+        page_size: int = config.peruse.page_size,
+    ):
+        self.listings = listings
+        self.page_size = page_size
+        self.num_loaded = 0
+        self.exhausted = False
+
+    def _load_page(self) -> list[models.Listing]:
+        return list(itertools.islice(self.listings, self.page_size))
+
+    def __iter__(self) -> Iterator[models.Listing]:
+        with ThreadPoolExecutor(1, "peruse_pager") as executor:
+            next_page = executor.submit(self._load_page)
+            while not self.exhausted:
+                page = next_page.result()
+                self.num_loaded += len(page)
+                if len(page) < self.page_size:
+                    self.exhausted = True
+                else:
+                    next_page = executor.submit(self._load_page)
+                yield from page
+
+
+def do_action(listing: models.Listing, actions: ActionBuffer) -> bool | None:
     """Take input and perform the desired action for `listing`.
 
     Returns `True` if user chooses `q`: `quit`."""
@@ -140,21 +236,17 @@ def do_action(listing: models.Listing) -> bool | None:
         )
         match action:
             case "a":
-                with JobBased() as db:
-                    db.pin_listing(listing.id)
-                    db.mark_seen(listing.id)
+                actions.pin(listing.id)
                 break
             case "d":
-                with JobBased() as db:
-                    db.mark_dead(listing.id)
+                actions.mark_dead(listing.id)
                 break
             case "o":
                 webbrowser.open(listing.url)
             case "q":
                 return True
             case "i":
-                with JobBased() as db:
-                    db.mark_seen(listing.id)
+                actions.mark_seen(listing.id)
                 break
             case _:
                 print("oops")
@@ -174,37 +266,140 @@ def show(listing: models.Listing, title: str):
     print(Grid([line], title, cast_values_to_strings=True, title_justify="left"))
 
 
-def peruse(listings: list[models.Listing]):
-    """Show each listing in `listings` and perform desired action."""
-    num_listings = len(listings)
-    print(f"Unseen listings: {num_listings}")
-    for i, listing in enumerate(listings, 1):
-        # print(f"{i}/{num_listings}")
-        show(listing, f"{i}/{num_listings}")
-        if do_action(listing):
-            break
+def peruse(
+    listings: Iterator[models.Listing], num_unseen: int, unfiltered: bool = False
+):
+    """Show each listing in `listings` and perform desired action.
 
+    `unfiltered` should be `True` if `num_unseen` includes listings the filters will hide.
 
-def main(args: argparse.Namespace):
+    Listings are loaded a page at a time and actions are written to the database in batches."""
+    print(f"Unseen listings{' (unfiltered)' if unfiltered else ''}: {num_unseen}")
+    pager = ListingPager(listings)
+    actions = ActionBuffer()
+    try:
+        for i, listing in enumerate(pager, 1):
+            # The total isn't known until the last page has been loaded
+            show(listing, f"{i}/{pager.num_loaded}{'' if pager.exhausted else '+'}")
+            if do_action(listing, actions):
+                break
+    finally:
+        actions.flush()
+
+
+# Listings that are still up and haven't been shown yet
+unseen = "alive = 1 AND listings.listing_id NOT IN (SELECT listing_id FROM seen_listings)"
+
+
+def retag_listings(filters: PeruseFilters):
+    """Tag stale listings with `filters` using a separate connection, see `JobBased.retag_listings`."""
     with JobBased() as db:
-        listings = db.get_unseen_live_listings()
-    if args.newest_first:
-        listings = listings[::-1]
-    # ========================
-    # filter unseen listings
-    # ========================
+        db.retag_listings(filters)
+
+
+def iter_stale_listings(
+    db: JobBased, stale_ids: list[int], order_by: str, batch_size: int = 1000
+) -> Iterator[models.Listing]:
+    """Lazily yield the unseen listings in `stale_ids`, which should be sorted the same way as `order_by`.
+
+    Listings are selected by id `batch_size` at a time, so listings tagged by the background re-tag
+    are still yielded and listings that became stale afterwards aren't."""
+    for i in range(0, len(stale_ids), batch_size):
+        batch = stale_ids[i : i + batch_size]
+        yield from db.iter_listings(
+            f"{unseen} AND listings.listing_id IN ({', '.join('?' * len(batch))})",
+            order_by,
+            parameters=batch,
+        )
+
+
+def get_tagged_where(
+    args: argparse.Namespace, filters: PeruseFilters
+) -> tuple[str, list[str]]:
+    """Returns a `where` clause, and its parameters, for the unseen listings tagged with the current `filters` that `args` would show."""
+    flags = ["version = ?"]
+    for flag, used in [
+        ("position_filtered", args.filter_positions),
+        ("location_filtered", args.filter_locations),
+        ("url_filtered", args.filter_urls),
+    ]:
+        if used:
+            flags.append(f"{flag} = 0")
+    where = f"{unseen} AND listings.listing_id IN (SELECT listing_id FROM listing_tags WHERE {' AND '.join(flags)})"
+    parameters = [filters.version]
+    # A listing is shown if its position has any of the key terms or default search terms
+    key_terms: list[str] = []
+    if args.default_search and filters.default_search:
+        key_terms.append(
+            "listings.listing_id IN (SELECT listing_id FROM listing_tags WHERE default_search = 1)"
+        )
+    if args.key_terms:
+        if all(
+            len(term) >= jobbased.min_search_term_length for term in args.key_terms
+        ):
+            key_terms.append(
+                "listings.listing_id IN (SELECT rowid FROM listings_fts WHERE listings_fts MATCH ?)"
+            )
+            parameters.append(jobbased.to_search_query(args.key_terms, "position"))
+        else:
+            clause, terms = like_any("listings.position", args.key_terms)
+            key_terms.append(f"({clause})")
+            parameters.extend(terms)
+    if key_terms:
+        where += f" AND ({' OR '.join(key_terms)})"
+    return where, parameters
+
+
+def main(args: argparse.Namespace):
     filters = PeruseFilters.load()
     default_search = filters.default_search if args.default_search else []
-    if args.filter_locations:
-        listings = filter_listings(listings, "location", [], filters.location_filters)
-    if args.filter_urls:
-        listings = filter_listings(listings, "url", [], filters.url_filters)
-    excludes = filters.position_filters if args.filter_positions else []
-    listings = filter_listings(
-        listings, "position", args.key_terms + default_search, excludes
-    )
-    # ========================
-    peruse(listings)
+    excludes = {
+        "location": filters.location_pattern if args.filter_locations else None,
+        "url": filters.url_pattern if args.filter_urls else None,
+        "position": filters.position_pattern if args.filter_positions else None,
+    }
+    order_by = "listings.listing_id DESC" if args.newest_first else "listings.listing_id"
+    stale = f"{unseen} AND listings.listing_id NOT IN (SELECT listing_id FROM listing_tags WHERE version = ?)"
+    with JobBased() as db:
+        # Tagged listings are filtered by an indexed query
+        where, parameters = get_tagged_where(args, filters)
+        # Snapshot the stale listings before the re-tag starts changing which listings are stale
+        stale_ids = [
+            row["listing_id"]
+            for row in db.query(
+                f"SELECT listing_id FROM listings WHERE {stale} ORDER BY {order_by};",
+                (filters.version,),
+            )
+        ]
+        listings = db.iter_listings(where, order_by, parameters=parameters)
+        if stale_ids:
+            # Stale listings can't be counted with the filters until they're tagged
+            num_unseen = db.count("listings", where=unseen)
+            # The filters changed or there are listings that haven't been tagged yet.
+            # Re-tag them in the background, and filter them in Python in the meantime.
+            threading.Thread(target=retag_listings, args=(filters,), daemon=True).start()
+            stale_set = set(stale_ids)
+            # Stale listings the re-tag gets to first would otherwise be shown twice
+            listings = (listing for listing in listings if listing.id not in stale_set)
+            untagged = filter_listings(
+                iter_stale_listings(db, stale_ids, order_by),
+                excludes,
+                compile_terms(args.key_terms + default_search),
+            )
+            listings = heapq.merge(
+                listings,
+                untagged,
+                key=lambda listing: listing.id,
+                reverse=args.newest_first,
+            )
+        else:
+            num_unseen = db.count("listings", where=where, parameters=parameters)
+        if args.ranked:
+            # Every listing has to be scored before the first one can be shown
+            ranker = ListingRanker.load(db, filters.default_search)
+            listings = iter(ranker.rank(list(listings)))
+        # Listings are streamed as pages are loaded
+        peruse(listings, num_unseen, bool(stale_ids))
 
 
 if __name__ == "__main__":
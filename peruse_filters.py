@@ -1,4 +1,9 @@
+import hashlib
+import json
+import re
 from dataclasses import asdict, dataclass, fields
+from functools import cached_property
+from typing import Any, Iterable
 
 import dacite
 from rich import print
@@ -10,6 +15,61 @@ from config import Config
 config = Config.load()
 
 
+def compile_terms(terms: Iterable[str]) -> re.Pattern[str] | None:
+    """Compile `terms` into one regex that matches any text containing at least one of them.
+
+    The terms are merged into a prefix tree first, so the regex engine tries each position of the text
+    against the tree's branches instead of against every term in turn.
+    Once a term ends, anything longer that starts with it can't change the result, so those branches are dropped.
+
+    Returns `None` if there are no terms."""
+    trie: dict[str, Any] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        # Empty key marks the end of a term
+        node[""] = {}
+    if not trie:
+        return None
+
+    def to_pattern(node: dict[str, Any]) -> str:
+        if "" in node:
+            return ""
+        ends = sorted(char for char, child in node.items() if "" in child)
+        branches = [
+            re.escape(char) + to_pattern(child)
+            for char, child in sorted(node.items())
+            if "" not in child
+        ]
+        if len(ends) == 1:
+            branches.append(re.escape(ends[0]))
+        elif ends:
+            branches.append("[" + "".join(re.escape(char) for char in ends) + "]")
+        return branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+
+    return re.compile(to_pattern(trie))
+
+
+def like_any(column: str, terms: Iterable[str]) -> tuple[str, list[str]]:
+    """Returns a `where` clause, and its parameters, matching rows where `column` contains any of `terms`.
+
+    `LIKE` is case insensitive for ASCII text, the same as matching `compile_terms` patterns against lowercased text.
+
+    Returns `("0", [])` if there are no terms."""
+    clauses: list[str] = []
+    parameters: list[str] = []
+    for term in terms:
+        clauses.append(f"{column} LIKE ? ESCAPE '\\'")
+        escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        parameters.append(f"%{escaped}%")
+    return (" OR ".join(clauses) or "0"), parameters
+
+
+# `(mtime, filters)` from the last time `peruse_filters.toml` was loaded
+_cache: tuple[float, "PeruseFilters"] | None = None
+
+
 @dataclass
 class PeruseFilters:
     position_filters: list[str]
@@ -28,14 +88,62 @@ class PeruseFilters:
     def load(
         cls,
     ) -> Self:
-        """Return an instance of this class populated from `peruse_filters.toml`."""
+        """Return an instance of this class populated from `peruse_filters.toml`.
+
+        The instance, along with its compiled patterns, is reused until the file is modified."""
+        global _cache
         path = config.peruse_filters_path
         if not path.exists():
             print(f"{path} does not exist.")
             print("Creating from template...")
             helpers.create_peruse_filters_from_template()
-        data = path.loads()
-        return dacite.from_dict(cls, data)
+        mtime = path.stat().st_mtime
+        if _cache and _cache[0] == mtime and isinstance(_cache[1], cls):
+            return _cache[1]
+        filters = dacite.from_dict(cls, path.loads())
+        _cache = (mtime, filters)
+        return filters
+
+    def to_where(self) -> tuple[str, list[str]]:
+        """Returns a `where` clause, and its parameters, matching listings that any of
+        `position_filters`, `location_filters`, or `url_filters` would exclude.
+
+        Returns `("0", [])` if there are no filters."""
+        clauses: list[str] = []
+        parameters: list[str] = []
+        for column, terms in [
+            ("position", self.position_filters),
+            ("location", self.location_filters),
+            ("url", self.url_filters),
+        ]:
+            if terms:
+                clause, column_parameters = like_any(column, terms)
+                clauses.append(clause)
+                parameters.extend(column_parameters)
+        return (" OR ".join(clauses) or "0"), parameters
+
+    @cached_property
+    def version(self) -> str:
+        """A hash of the filters' contents.
+
+        Listing tags stamped with a different version were made with different filters and have to be redone."""
+        data = json.dumps(asdict(self), sort_keys=True)
+        return hashlib.sha1(data.encode()).hexdigest()
+
+    @cached_property
+    def position_pattern(self) -> re.Pattern[str] | None:
+        """`position_filters` compiled with `compile_terms`."""
+        return compile_terms(self.position_filters)
+
+    @cached_property
+    def location_pattern(self) -> re.Pattern[str] | None:
+        """`location_filters` compiled with `compile_terms`."""
+        return compile_terms(self.location_filters)
+
+    @cached_property
+    def url_pattern(self) -> re.Pattern[str] | None:
+        """`url_filters` compiled with `compile_terms`."""
+        return compile_terms(self.url_filters)
 
     def dump(self):
         """Write the contents of this instance to `path`."""
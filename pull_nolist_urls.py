@@ -16,10 +16,10 @@ def main():
         .events[-1]
     )
     stems = [stem.strip() for stem in event.message.split()[1:]]
-    urls: list[str] = []
     with JobBased() as db:
-        for stem in stems:
-            urls.append(db.get_board(stem).url)
+        boards = db.get_boards_from_stems(stems)
+        # `get_board` falls back to matching on name for any stems that weren't found
+        urls = [(boards.get(stem) or db.get_board(stem)).url for stem in stems]
     print(*urls, sep="\n")
 
 
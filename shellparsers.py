@@ -74,3 +74,123 @@ def get_update_board_url_parser() -> argshell.ArgShellParser:
     parser.add_argument("id", type=int, help=""" The id of the board to update""")
     parser.add_argument("url", type=str, help=""" The new url.""")
     return parser
+
+
+def get_search_parser() -> argshell.ArgShellParser:
+    """Returns a `search` parser."""
+    parser = argshell.ArgShellParser(
+        "search",
+        description="Search listing positions and locations with the full text index.",
+    )
+    parser.add_argument(
+        "terms",
+        nargs="+",
+        type=str,
+        help=""" Show listings whose position or location contains any of these terms (case insensitive, at least 3 characters each). """,
+    )
+    parser.add_argument(
+        "-p",
+        "--positions",
+        action="store_true",
+        help=""" Only search listing positions. """,
+    )
+    parser.add_argument(
+        "-d",
+        "--dead",
+        action="store_true",
+        help=""" Include listings that are no longer up. """,
+    )
+    parser.add_argument(
+        "-s",
+        "--seen",
+        action="store_true",
+        help=""" Include listings that have already been seen. """,
+    )
+    parser.add_argument(
+        "-r",
+        "--raw",
+        action="store_true",
+        help=""" Treat `terms` as an FTS5 query, e.g. `search -r 'position : python NOT location : onsite'`. """,
+    )
+    return parser
+
+
+def get_save_search_parser() -> argshell.ArgShellParser:
+    """Returns a `save_search` parser."""
+    parser = argshell.ArgShellParser(
+        "save_search",
+        description="Save a search. After each glob, newly added listings that match it are recorded for `search_hits`.",
+    )
+    parser.add_argument("name", type=str, help=""" The name to save the search as. """)
+    parser.add_argument(
+        "terms",
+        nargs="+",
+        type=str,
+        help=""" Match listings whose position or location contains any of these terms (case insensitive, at least 3 characters each). """,
+    )
+    parser.add_argument(
+        "-p",
+        "--positions",
+        action="store_true",
+        help=""" Only search listing positions. """,
+    )
+    parser.add_argument(
+        "-r",
+        "--raw",
+        action="store_true",
+        help=""" Treat `terms` as an FTS5 query, e.g. `save_search remote_python -r 'position : python AND location : remote'`. """,
+    )
+    return parser
+
+
+def get_search_hits_parser() -> argshell.ArgShellParser:
+    """Returns a `search_hits` parser."""
+    parser = argshell.ArgShellParser(
+        "search_hits",
+        description="Show the listings found by a saved search, or the number of hits for each saved search if no name is given.",
+    )
+    parser.add_argument(
+        "name", nargs="?", type=str, default=None, help=""" A saved search name. """
+    )
+    parser.add_argument(
+        "-d",
+        "--dead",
+        action="store_true",
+        help=""" Include listings that are no longer up. """,
+    )
+    parser.add_argument(
+        "-s",
+        "--seen",
+        action="store_true",
+        help=""" Include listings that have already been seen. """,
+    )
+    return parser
+
+
+def get_bulk_triage_parser() -> argshell.ArgShellParser:
+    """Returns a parser for the `bulk_*` triage commands."""
+    parser = argshell.ArgShellParser(
+        description="Apply an action to every listing matching a `where` clause and/or the `peruse_filters.toml` filters."
+    )
+    parser.add_argument(
+        "where",
+        nargs="*",
+        type=str,
+        default=[],
+        help=""" An SQL `where` clause that can reference columns of the `listings` and `companies` tables.
+        Wrap it in double quotes to keep any single quotes,
+        e.g. `"companies.name = 'Company' AND position LIKE '%senior%'"`. """,
+    )
+    parser.add_argument(
+        "-f",
+        "--filtered",
+        action="store_true",
+        help=""" Only include listings that `position_filters`, `location_filters`, or `url_filters` in `peruse_filters.toml` would exclude. """,
+    )
+    parser.add_argument(
+        "-y",
+        "--yes",
+        action="store_true",
+        help=""" Don't ask for confirmation. """,
+    )
+    return parser
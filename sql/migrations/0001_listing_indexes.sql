@@ -0,0 +1,16 @@
+-- Covering index for per company lookups and `JobBased.reconcile_listings`
+CREATE INDEX IF NOT EXISTS
+    listings_company_id_alive_url_idx ON listings (company_id, alive, url);
+
+-- `JobBased.get_live_listings`, `get_dead_listings`, and `get_unseen_live_listings`
+-- (`listing_id` is the rowid so the index covers the `seen_listings` anti-join)
+CREATE INDEX IF NOT EXISTS
+    listings_alive_idx ON listings (alive);
+
+-- New listings since the start of a glob
+CREATE INDEX IF NOT EXISTS
+    listings_date_added_idx ON listings (date_added);
+
+-- Listings that died since the start of a glob
+CREATE INDEX IF NOT EXISTS
+    listings_date_removed_idx ON listings (date_removed);
@@ -0,0 +1,11 @@
+-- `apps` view's join from applications to rejections
+CREATE INDEX IF NOT EXISTS
+    rejections_application_id_idx ON rejections (application_id, rejection_id, date_rejected);
+
+-- `pinned` view's join from listings to applications
+CREATE INDEX IF NOT EXISTS
+    applications_listing_id_idx ON applications (listing_id, application_id);
+
+-- `scrapers` view and `JobBased.get_boards`
+CREATE INDEX IF NOT EXISTS
+    boards_company_id_idx ON boards (company_id);
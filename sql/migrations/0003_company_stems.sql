@@ -0,0 +1,26 @@
+-- Scraper file stem for each company, i.e. `helpers.name_to_stem(name)`,
+-- so `JobBased.get_board` can look boards up by stem with an index instead of scanning every board
+ALTER TABLE
+    companies
+ADD COLUMN
+    stem TEXT;
+
+UPDATE
+    companies
+SET
+    stem = lower(replace(name, ' ', '_'));
+
+CREATE INDEX IF NOT EXISTS
+    companies_stem_idx ON companies (stem);
+
+CREATE TRIGGER IF NOT EXISTS
+    companies_stem_insert AFTER INSERT ON companies
+BEGIN
+    UPDATE companies SET stem = lower(replace(NEW.name, ' ', '_')) WHERE company_id = NEW.company_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS
+    companies_stem_update AFTER UPDATE OF name ON companies
+BEGIN
+    UPDATE companies SET stem = lower(replace(NEW.name, ' ', '_')) WHERE company_id = NEW.company_id;
+END;
@@ -0,0 +1,36 @@
+-- Full text index of listing positions and locations for `JobBased.search_listings`.
+-- The trigram tokenizer matches any case insensitive substring of at least 3 characters,
+-- same as the substring checks `peruse` used to do in Python.
+-- The index doesn't store its own copy of the text (`content = listings`), so it's kept in sync by the triggers below.
+CREATE VIRTUAL TABLE IF NOT EXISTS
+    listings_fts USING fts5 (
+        position,
+        location,
+        content = listings,
+        content_rowid = listing_id,
+        tokenize = trigram
+    );
+
+INSERT INTO
+    listings_fts (listings_fts)
+VALUES
+    ('rebuild');
+
+CREATE TRIGGER IF NOT EXISTS
+    listings_fts_insert AFTER INSERT ON listings
+BEGIN
+    INSERT INTO listings_fts (rowid, position, location) VALUES (NEW.listing_id, NEW.position, NEW.location);
+END;
+
+CREATE TRIGGER IF NOT EXISTS
+    listings_fts_delete AFTER DELETE ON listings
+BEGIN
+    INSERT INTO listings_fts (listings_fts, rowid, position, location) VALUES ('delete', OLD.listing_id, OLD.position, OLD.location);
+END;
+
+CREATE TRIGGER IF NOT EXISTS
+    listings_fts_update AFTER UPDATE OF position, location ON listings
+BEGIN
+    INSERT INTO listings_fts (listings_fts, rowid, position, location) VALUES ('delete', OLD.listing_id, OLD.position, OLD.location);
+    INSERT INTO listings_fts (rowid, position, location) VALUES (NEW.listing_id, NEW.position, NEW.location);
+END;
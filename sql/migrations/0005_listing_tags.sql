@@ -0,0 +1,22 @@
+-- Which `peruse_filters.toml` filters each listing matches, so `peruse` can filter listings with an indexed query.
+-- Each row is stamped with the `PeruseFilters.version` it was tagged with;
+-- rows with any other version are stale and get re-tagged by `JobBased.retag_listings`.
+-- Listings are tagged as they're added, existing listings are tagged the first time `peruse` runs.
+CREATE TABLE IF NOT EXISTS
+    listing_tags (
+        listing_id INTEGER PRIMARY KEY REFERENCES listings (listing_id) ON DELETE CASCADE ON UPDATE CASCADE,
+        version TEXT NOT NULL,
+        position_filtered INTEGER NOT NULL,
+        location_filtered INTEGER NOT NULL,
+        url_filtered INTEGER NOT NULL,
+        default_search INTEGER NOT NULL
+    );
+
+CREATE INDEX IF NOT EXISTS
+    listing_tags_version_idx ON listing_tags (
+        version,
+        position_filtered,
+        location_filtered,
+        url_filtered,
+        default_search
+    );
@@ -0,0 +1,21 @@
+-- Document statistics of listing positions for ranking listings with BM25, see `listingranker.py`.
+-- `position_terms` has the number of listings whose position contains each term.
+-- `position_terms_state` has a single row with the totals and the last listing counted,
+-- so the statistics can be brought up to date by only counting listings added since.
+CREATE TABLE IF NOT EXISTS
+    position_terms (
+        term TEXT PRIMARY KEY,
+        document_count INTEGER NOT NULL
+    ) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS
+    position_terms_state (
+        last_listing_id INTEGER NOT NULL,
+        document_count INTEGER NOT NULL,
+        total_length INTEGER NOT NULL
+    );
+
+INSERT INTO
+    position_terms_state (last_listing_id, document_count, total_length)
+VALUES
+    (0, 0, 0);
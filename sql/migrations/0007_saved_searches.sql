@@ -0,0 +1,23 @@
+-- Searches saved with `jobshell`'s `save_search` command, see `JobBased.run_saved_searches`.
+-- `query` is an FTS5 query against `listings_fts`.
+-- `last_listing_id` is the cursor: the newest listing the search has been tested against,
+-- so each run only has to test listings added since the last one.
+CREATE TABLE IF NOT EXISTS
+    saved_searches (
+        search_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE NOT NULL,
+        query TEXT NOT NULL,
+        last_listing_id INTEGER NOT NULL DEFAULT 0,
+        date_added TIMESTAMP
+    );
+
+CREATE TABLE IF NOT EXISTS
+    search_hits (
+        search_id INTEGER REFERENCES saved_searches (search_id) ON DELETE CASCADE ON UPDATE CASCADE,
+        listing_id INTEGER REFERENCES listings (listing_id) ON DELETE CASCADE ON UPDATE CASCADE,
+        date_found TIMESTAMP,
+        PRIMARY KEY (search_id, listing_id)
+    );
+
+CREATE INDEX IF NOT EXISTS
+    search_hits_listing_id_idx ON search_hits (listing_id);
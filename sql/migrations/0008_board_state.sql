@@ -0,0 +1,10 @@
+-- Per board scrape statistics, see `JobBased.record_board_runtimes`.
+-- `JobGlob` starts the boards with the longest `average_runtime` first.
+CREATE TABLE IF NOT EXISTS
+    board_state (
+        board_id INTEGER PRIMARY KEY REFERENCES boards (board_id) ON DELETE CASCADE ON UPDATE CASCADE,
+        average_runtime REAL,
+        last_runtime REAL,
+        num_runs INTEGER NOT NULL DEFAULT 0,
+        last_scraped TIMESTAMP
+    );
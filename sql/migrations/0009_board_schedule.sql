@@ -0,0 +1,12 @@
+-- Per board scrape schedule for `jobglob_daemon.py`, see `JobBased.update_board_schedules`.
+-- `change_rate` is an average of the number of listings added or removed per scrape.
+-- Boards that changed get scraped more often, down to `jobglob_daemon.glob_interval` seconds apart,
+-- and boards that didn't back off, up to `jobglob_daemon.max_interval` seconds apart.
+ALTER TABLE board_state ADD COLUMN change_rate REAL;
+
+ALTER TABLE board_state ADD COLUMN scrape_interval REAL;
+
+ALTER TABLE board_state ADD COLUMN next_due TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS
+    board_state_next_due_idx ON board_state (next_due);
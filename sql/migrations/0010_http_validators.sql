@@ -0,0 +1,12 @@
+-- `ETag` and `Last-Modified` response headers per board and url, see `JobGruel.request_if_modified`.
+-- They're sent back as `If-None-Match` and `If-Modified-Since` so a board that hasn't changed
+-- can answer with a 304 and skip being parsed.
+CREATE TABLE IF NOT EXISTS
+    http_validators (
+        board_id INTEGER REFERENCES boards (board_id) ON DELETE CASCADE ON UPDATE CASCADE,
+        url TEXT NOT NULL,
+        etag TEXT,
+        last_modified TEXT,
+        date_updated TIMESTAMP,
+        PRIMARY KEY (board_id, url)
+    );
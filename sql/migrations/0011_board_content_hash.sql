@@ -0,0 +1,3 @@
+-- Hash of each board's response bodies from its last successful scrape, see `JobGruel._fetch_and_parse`.
+-- If a board's bodies hash the same next scrape, parsing, storing, and reconciling its listings are skipped.
+ALTER TABLE board_state ADD COLUMN content_hash TEXT;
@@ -0,0 +1,187 @@
+import hashlib
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+
+import pytest
+from databased import Databased
+from pathier import Pathier
+
+root = Pathier(__file__).parent.parent
+sys.path.insert(0, str(root))
+
+import jobbased
+import jobgruel
+import models
+from config import Config
+
+config = Config.load()
+""" `JobGruel.request_if_modified` against a local server that sends `ETag` and `Last-Modified`
+and answers a matching `If-None-Match` with a 304.
+"""
+
+LAST_MODIFIED = "Sat, 17 Oct 2026 00:00:00 GMT"
+
+
+def make_page(num_listings: int, broken: bool = False) -> bytes:
+    """Returns a Greenhouse style board with `num_listings` openings.
+
+    If `broken`, an opening without a link is added so parsing it fails."""
+    openings = "".join(
+        f'<div class="opening"><a href="/test/jobs/{i}">Engineer {i}</a><span>Remote</span></div>'
+        for i in range(num_listings)
+    )
+    if broken:
+        openings += '<div class="opening"><span>No link</span></div>'
+    return f"<html><body>{openings}</body></html>".encode()
+
+
+class BoardServer:
+    """Serves `self.body` at `/board` and records the headers of every request."""
+
+    def __init__(self):
+        self.body = make_page(3)
+        self.request_headers: list[dict[str, str]] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.request_headers.append(dict(self.headers))
+                etag = f'"{hashlib.md5(server.body).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", LAST_MODIFIED)
+                self.send_header("Content-Type", "text/html")
+                self.send_header("Content-Length", str(len(server.body)))
+                self.end_headers()
+                self.wfile.write(server.body)
+
+            def log_message(self, *args: Any):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/board"
+
+    @property
+    def etag(self) -> str:
+        return f'"{hashlib.md5(self.body).hexdigest()}"'
+
+
+@pytest.fixture
+def server() -> Iterator[BoardServer]:
+    board_server = BoardServer()
+    thread = threading.Thread(target=board_server.httpd.serve_forever, daemon=True)
+    thread.start()
+    yield board_server
+    board_server.httpd.shutdown()
+    board_server.httpd.server_close()
+
+
+@pytest.fixture
+def paths(tmp_path: Pathier, monkeypatch: pytest.MonkeyPatch) -> Pathier:
+    """Point the database, logs, and peruse filters of every module's config into `tmp_path`."""
+    tmp_path = Pathier(tmp_path)
+    for module in (jobbased, jobgruel):
+        monkeypatch.setattr(module.config, "db_path", tmp_path / "jobs.db")
+        monkeypatch.setattr(module.config, "logs_dir", tmp_path / "logs")
+        monkeypatch.setattr(
+            module.config, "peruse_filters_path", tmp_path / "peruse_filters.toml"
+        )
+    return tmp_path
+
+
+@pytest.fixture
+def board(paths: Pathier, server: BoardServer) -> Iterator[models.Board]:
+    """A board for `server` in a temporary database."""
+    with Databased(paths / "jobs.db", log_dir=paths / "logs") as db:
+        db.execute_script(config.sql_dir / "schema.sql")
+        for view in config.sql_dir.glob("*_view.sql"):
+            db.execute_script(view)
+    with jobbased.JobBased() as db:
+        db.add_board(server.url, "Conditional Requests Test")
+        board = db.get_boards()[0]
+    yield board
+    jobbased.close_pools()
+
+
+def scrape(
+    board: models.Board, monkeypatch: pytest.MonkeyPatch
+) -> tuple[jobgruel.GreenhouseGruel, dict[str, int]]:
+    """Scrape `board` and return the scraper and how many times parsing and reconciling ran."""
+    calls = {"get_parsable_items": 0, "reconcile_listings": 0}
+    scraper = jobgruel.GreenhouseGruel(board=board)
+    for name in calls:
+        method = getattr(scraper, name)
+
+        def counted(*args: Any, name: str = name, method: Any = method) -> Any:
+            calls[name] += 1
+            return method(*args)
+
+        monkeypatch.setattr(scraper, name, counted)
+    scraper.scrape()
+    return scraper, calls
+
+
+def get_validators(board: models.Board) -> dict[str, tuple[str | None, str | None]]:
+    with jobbased.JobBased() as db:
+        return db.get_http_validators(board.id).get(board.id, {})
+
+
+def count_live_listings() -> int:
+    with jobbased.JobBased() as db:
+        return db.count("listings", where="alive = 1")
+
+
+def test_unchanged_board_is_skipped(
+    server: BoardServer, board: models.Board, monkeypatch: pytest.MonkeyPatch
+):
+    scraper, calls = scrape(board, monkeypatch)
+    assert not scraper.unchanged
+    assert calls == {"get_parsable_items": 1, "reconcile_listings": 1}
+    assert count_live_listings() == 3
+    assert get_validators(board) == {server.url: (server.etag, LAST_MODIFIED)}
+
+    scraper, calls = scrape(board, monkeypatch)
+    assert server.request_headers[-1]["If-None-Match"] == server.etag
+    assert server.request_headers[-1]["If-Modified-Since"] == LAST_MODIFIED
+    assert scraper.unchanged
+    assert calls == {"get_parsable_items": 0, "reconcile_listings": 0}
+    assert count_live_listings() == 3
+
+
+def test_validators_not_saved_after_failures(
+    server: BoardServer, board: models.Board, monkeypatch: pytest.MonkeyPatch
+):
+    scrape(board, monkeypatch)
+    validators = get_validators(board)
+
+    server.body = make_page(4, broken=True)
+    scraper, _ = scrape(board, monkeypatch)
+    assert scraper.had_failures
+    assert get_validators(board) == validators
+
+    # The old validators don't match, so the board is fetched and parsed in full again
+    scraper, calls = scrape(board, monkeypatch)
+    assert not scraper.unchanged
+    assert calls["get_parsable_items"] == 1
+
+
+def test_changed_board_is_parsed(
+    server: BoardServer, board: models.Board, monkeypatch: pytest.MonkeyPatch
+):
+    scrape(board, monkeypatch)
+
+    server.body = make_page(5)
+    scraper, calls = scrape(board, monkeypatch)
+    assert server.request_headers[-1]["If-None-Match"] != server.etag
+    assert not scraper.unchanged
+    assert calls == {"get_parsable_items": 1, "reconcile_listings": 1}
+    assert scraper.new_listings == 2
+    assert count_live_listings() == 5
+    assert get_validators(board) == {server.url: (server.etag, LAST_MODIFIED)}